@@ -1,19 +1,66 @@
 """AI Service for unified Semantic Kernel operations."""
 
-from collections.abc import AsyncGenerator
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable, Hashable
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+from hashlib import blake2b
 import logging
-from typing import Any
+import random
+from typing import Any, Final, TypeVar
 
 from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
 from semantic_kernel.contents import ChatHistory
 
 from kernel_manager import kernel_manager
+from semantic_cache import SemanticCache
+from shared.utils import TTLCache
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Retry policy for Azure OpenAI rate limiting (HTTP 429)
+_RATE_LIMIT_ATTEMPTS: Final[int] = 3
+_RATE_LIMIT_INITIAL_WAIT: Final[float] = 0.2
+_RATE_LIMIT_MAX_WAIT: Final[float] = 2.0
+
+# Function choice behavior is stateless, so a single instance is shared by all requests
+_AUTO_FCB = FunctionChoiceBehavior.Auto()
+
+
+@lru_cache(maxsize=8)
+def _settings_class_for(chat_completion_cls: type[AzureChatCompletion]) -> type:
+    """Resolve the prompt execution settings class once per chat completion service type."""
+    return chat_completion_cls.get_prompt_execution_settings_class()
+
+
+@lru_cache(maxsize=128)
+def _build_settings(
+    chat_completion_cls: type[AzureChatCompletion],
+    max_tokens: int,
+    temperature: float,
+    top_p: float,
+    frequency_penalty: float,
+    presence_penalty: float,
+    function_calling: bool,
+):
+    """Build a template execution settings object for an option set."""
+    settings = _settings_class_for(chat_completion_cls)(
+        max_tokens=max_tokens,
+        temperature=temperature,
+        top_p=top_p,
+        frequency_penalty=frequency_penalty,
+        presence_penalty=presence_penalty,
+    )
+
+    if function_calling:
+        settings.function_choice_behavior = _AUTO_FCB
+
+    return settings
+
 
 class OutputFormat(Enum):
     """Output format options for AI responses."""
@@ -23,7 +70,7 @@ class OutputFormat(Enum):
     JSON = "json"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AIOptions:
     """Configuration options for AI operations."""
 
@@ -38,18 +85,63 @@ class AIOptions:
 
     def to_execution_settings(self, chat_completion: AzureChatCompletion):
         """Convert to Semantic Kernel execution settings."""
-        settings = chat_completion.get_prompt_execution_settings_class()(
-            max_tokens=self.max_tokens,
-            temperature=self.temperature,
-            top_p=self.top_p,
-            frequency_penalty=self.frequency_penalty,
-            presence_penalty=self.presence_penalty,
+        template = _build_settings(
+            type(chat_completion),
+            self.max_tokens,
+            self.temperature,
+            self.top_p,
+            self.frequency_penalty,
+            self.presence_penalty,
+            self.function_calling,
         )
+        # Semantic Kernel writes tool definitions onto the settings object during a call,
+        # so each request gets its own shallow copy of the cached template.
+        return template.model_copy()
+
+
+# Shared defaults; AIOptions is frozen so these are safe to reuse across requests
+_DEFAULT_SIMPLE_OPTIONS: Final[AIOptions] = AIOptions(function_calling=False)
+_TITLE_OPTIONS: Final[AIOptions] = AIOptions(max_tokens=1000, function_calling=False)
+
+# Number of leading messages (three user/assistant pairs) used to generate a title
+_TITLE_MAX_MESSAGES: Final[int] = 6
+
+# Fixed boilerplate around the conversation text in the title prompt
+_TITLE_PREFIX: Final[str] = "Generate a concise, descriptive title (5-8 words max) for this conversation:\n\n"
+_TITLE_SUFFIX: Final[str] = "\n\nTitle:"
 
-        if self.function_calling:
-            settings.function_choice_behavior = FunctionChoiceBehavior.Auto()
 
-        return settings
+def _prompt_digest(text: str) -> str:
+    """Short, stable digest of a prompt for use in cache keys."""
+    return blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _is_rate_limited(error: BaseException) -> bool:
+    """Whether an error, or any error it wraps, is an HTTP 429 response."""
+    seen = 0
+    current: BaseException | None = error
+    while current is not None and seen < 5:
+        if getattr(current, "status_code", None) == 429:
+            return True
+        current = current.__cause__ or current.__context__
+        seen += 1
+    return False
+
+
+async def _retry_on_rate_limit(call: Callable[[], Awaitable[T]]) -> T:
+    """Run call, retrying rate-limited attempts with jittered exponential backoff."""
+    attempt = 1
+    while True:
+        try:
+            return await call()
+        except Exception as e:
+            if attempt >= _RATE_LIMIT_ATTEMPTS or not _is_rate_limited(e):
+                raise
+            wait = min(_RATE_LIMIT_MAX_WAIT, _RATE_LIMIT_INITIAL_WAIT * 2 ** (attempt - 1))
+            wait += random.uniform(0, _RATE_LIMIT_INITIAL_WAIT)
+            logger.info("Rate limited by Azure OpenAI, retrying in %.2fs (attempt %d)", wait, attempt)
+            await asyncio.sleep(wait)
+            attempt += 1
 
 
 class AIService:
@@ -57,36 +149,58 @@ class AIService:
 
     def __init__(self):
         self.kernel_manager = kernel_manager
+        self._inflight: dict[Hashable, asyncio.Future[str]] = {}
+        # Exact-match cache of per-user completions, keyed like the in-flight calls
+        self._response_cache = TTLCache(maxsize=10_000, ttl=3600)
+        # Near-duplicate title cache, enabled when an embedding deployment is configured
+        self._title_semantic_cache = SemanticCache(threshold=0.9)
 
     async def initialize(self):
         """Initialize the AI service."""
+        self._title_semantic_cache.initialize()
         logger.info("AI service initialized successfully")
-        # AI service doesn't require specific initialization
-        pass
 
     async def cleanup(self):
         """Cleanup the AI service."""
+        self._response_cache.clear()
+        self._title_semantic_cache.clear()
         logger.info("AI service cleanup completed")
-        # AI service doesn't require specific cleanup
-        pass
+
+    async def _coalesce(self, key: Hashable, call: Callable[[], Awaitable[str]]) -> str:
+        """Share one in-flight LLM call between concurrent requests with the same key."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so a cancelled caller does not cancel the call for the others waiting on it
+        return await asyncio.shield(task)
 
     async def chat_completion_streaming(
         self, user_id: str, tenant_id: str, messages: list[dict[str, str]], options: AIOptions
     ) -> AsyncGenerator[dict[str, Any], None]:
         """Generate streaming chat completion with function calling support."""
-        async with self.kernel_manager.get_kernel(user_id, tenant_id) as user_kernel:
+        user_kernel = await self.kernel_manager.acquire_kernel(user_id, tenant_id)
+        error = None
+        try:
             async for chunk in user_kernel.kernel_manager.chat_completion_streaming(
                 messages=messages, system_message=options.system_message, options=options
             ):
                 yield chunk
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            await self.kernel_manager.release_kernel(user_kernel, error)
 
     async def chat_completion_text(
         self, user_id: str, tenant_id: str, messages: list[dict[str, str]], options: AIOptions
     ) -> str:
         """Generate text completion without streaming."""
-        async with self.kernel_manager.get_kernel(user_id, tenant_id) as user_kernel:
-            kernel = user_kernel.kernel_manager.kernel
-            chat_completion = kernel.get_service(type=AzureChatCompletion)
+        user_kernel = await self.kernel_manager.acquire_kernel(user_id, tenant_id)
+        error = None
+        try:
+            chat_completion = user_kernel.azure_chat_completion
             execution_settings = options.to_execution_settings(chat_completion)
 
             # Create chat history
@@ -96,90 +210,136 @@ class AIService:
             if options.system_message:
                 chat_history.add_system_message(options.system_message)
 
-            # Add conversation history
+            # Add conversation history, dispatching on role
+            handlers = {
+                "user": chat_history.add_user_message,
+                "assistant": chat_history.add_assistant_message,
+                "system": chat_history.add_system_message,
+            }
             for message in messages:
-                if message["role"] == "user":
-                    chat_history.add_user_message(message["content"])
-                elif message["role"] == "assistant":
-                    chat_history.add_assistant_message(message["content"])
+                handler = handlers.get(message["role"])
+                if handler is not None:
+                    handler(message["content"])
 
             # Get response
             response = await chat_completion.get_chat_message_content(
                 chat_history=chat_history,
                 settings=execution_settings,
-                kernel=kernel if options.function_calling else None,
+                kernel=user_kernel.kernel_manager.kernel if options.function_calling else None,
             )
 
             return str(response.content) if response.content else ""
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            await self.kernel_manager.release_kernel(user_kernel, error)
 
     async def simple_completion(
         self, user_id: str, tenant_id: str, prompt: str, options: AIOptions | None = None
     ) -> str:
         """Generate simple text completion from a single prompt."""
-        if options is None:
-            options = AIOptions(function_calling=False)
-
+        options = options or _DEFAULT_SIMPLE_OPTIONS
         messages = [{"role": "user", "content": prompt}]
-        return await self.chat_completion_text(user_id, tenant_id, messages, options)
+
+        # Plugin calls can be time-dependent or have side effects, so their output is never replayed
+        if options.function_calling:
+            return await self.chat_completion_text(user_id, tenant_id, messages, options)
+
+        # Keyed per user: the completion runs on the caller's kernel, so neither the in-flight call nor
+        # its cached result may be handed to another user
+        cache_key = ("simple", tenant_id, user_id, _prompt_digest(prompt), options)
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = await self._coalesce(
+            cache_key, lambda: self.chat_completion_text(user_id, tenant_id, messages, options)
+        )
+        self._response_cache.set(cache_key, result)
+        return result
 
     async def generate_title(self, user_id: str, tenant_id: str, conversation_messages: list[dict[str, str]]) -> str:
         """Generate a concise title for a conversation using existing user kernel."""
-        # Create conversation text
-        conversation_text = ""
-        for msg in conversation_messages:
+        # Create conversation text; the first few turns carry enough signal for a title
+        parts = []
+        for msg in conversation_messages[:_TITLE_MAX_MESSAGES]:
             content = msg.get("content", "")
-            if len(content) > 200:
-                conversation_text += f"{msg['role']}: {content[:200]}...\n"
-            else:
-                conversation_text += f"{msg['role']}: {content}\n"
+            parts.append(f"{msg['role']}: {content[:200]}{'...' if len(content) > 200 else ''}")
+        conversation_text = "\n".join(parts)
 
-        title_prompt = f"""Generate a concise, descriptive title (5-8 words max) for this conversation:
+        title_prompt = _TITLE_PREFIX + conversation_text + _TITLE_SUFFIX
 
-{conversation_text}
+        cache_key = ("title", tenant_id, user_id, _prompt_digest(conversation_text))
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-Title:"""
+        # Fall back to a near-duplicate lookup before paying for a completion; scoped per user, since a
+        # title is derived from the conversation it was generated for
+        embedding = await self._title_semantic_cache.embed(conversation_text)
+        if embedding is not None:
+            cached = await self._title_semantic_cache.lookup((tenant_id, user_id), embedding)
+            if cached is not None:
+                self._response_cache.set(cache_key, cached)
+                return cached
 
         try:
-            # Use existing user kernel directly for efficiency
-            async with self.kernel_manager.get_kernel(user_id, tenant_id) as user_kernel:
-                kernel = user_kernel.kernel_manager.kernel
-                chat_completion = kernel.get_service(type=AzureChatCompletion)
-
-                # Create execution settings for title generation
-                execution_settings = chat_completion.get_prompt_execution_settings_class()(
-                    max_tokens=1000,
-                    temperature=0.7,
-                    top_p=0.9,
-                    frequency_penalty=0.0,
-                    presence_penalty=0.0,
-                )
+            generated_title = await self._coalesce(
+                cache_key, lambda: self._complete_title(user_id, tenant_id, title_prompt)
+            )
+            self._response_cache.set(cache_key, generated_title)
+            if embedding is not None and generated_title:
+                await self._title_semantic_cache.store((tenant_id, user_id), embedding, generated_title)
+            return generated_title
+        except Exception as e:
+            logger.warning("Failed to generate title: %s", e)
+            # Fallback to first user message
+            first_user_msg = next((msg for msg in conversation_messages if msg["role"] == "user"), None)
+            if first_user_msg:
+                return first_user_msg["content"][:64].strip()[:50]
+            return "Chat Conversation"
+
+    async def _complete_title(self, user_id: str, tenant_id: str, title_prompt: str) -> str:
+        """Run the title prompt against the user's kernel and clean up the result."""
+        # Use existing user kernel directly for efficiency
+        user_kernel = await self.kernel_manager.acquire_kernel(user_id, tenant_id)
+        error = None
+        try:
+            chat_completion = user_kernel.azure_chat_completion
 
-                # Create chat history with title prompt
-                chat_history = ChatHistory()
-                chat_history.add_user_message(title_prompt)
+            # Create execution settings for title generation
+            execution_settings = _TITLE_OPTIONS.to_execution_settings(chat_completion)
 
-                # Get response without function calling for efficiency
-                response = await chat_completion.get_chat_message_content(
+            # Create chat history with title prompt
+            chat_history = ChatHistory()
+            chat_history.add_user_message(title_prompt)
+
+            # Get response without function calling for efficiency
+            response = await _retry_on_rate_limit(
+                lambda: chat_completion.get_chat_message_content(
                     chat_history=chat_history,
                     settings=execution_settings,
                     kernel=None,  # No function calling needed for title generation
                 )
-
-                generated_title = str(response.content) if response.content else ""
-                return generated_title.strip("\"'").strip()[:50]
-
+            )
         except Exception as e:
-            logger.warning("Failed to generate title: %s", e)
-            # Fallback to first user message
-            first_user_msg = next((msg for msg in conversation_messages if msg["role"] == "user"), None)
-            if first_user_msg:
-                return first_user_msg["content"][:50].strip()
-            return "Chat Conversation"
+            error = e
+            raise
+        finally:
+            await self.kernel_manager.release_kernel(user_kernel, error)
+
+        content = response.content
+        # One strip pass over quotes and whitespace, then a single slice
+        return str(content).strip("\"' \t\n\r")[:50] if content else ""
 
     async def get_available_plugins(self, user_id: str, tenant_id: str) -> dict[str, Any]:
         """Get information about available plugins for a user."""
-        async with self.kernel_manager.get_kernel(user_id, tenant_id) as user_kernel:
+        user_kernel = await self.kernel_manager.acquire_kernel(user_id, tenant_id)
+        try:
             return user_kernel.kernel_manager.get_available_plugins()
+        finally:
+            await self.kernel_manager.release_kernel(user_kernel)
 
     def get_kernel_metrics(self) -> dict[str, Any]:
         """Get metrics about active Semantic Kernel instances."""
@@ -0,0 +1,36 @@
+"""chat history indexes
+
+Revision ID: 7c1e4a9d2b50
+Revises: 2ba7cf13f9be
+Create Date: 2025-10-15 09:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7c1e4a9d2b50"
+down_revision = "2ba7cf13f9be"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, and avoids blocking writes on populated tables
+    with op.get_context().autocommit_block():
+        # Messages of a session in chronological order
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_messages_v4_session_id_created_at "
+            "ON chat_messages_v4 (session_id, created_at)"
+        )
+        # A user's sessions, most recently updated first
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_sessions_v4_user_id_updated_at "
+            "ON chat_sessions_v4 (user_id, updated_at DESC)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chat_sessions_v4_user_id_updated_at")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_chat_messages_v4_session_id_created_at")
@@ -0,0 +1,31 @@
+"""drop master is_active indexes
+
+Revision ID: 4f8b2d6e1a93
+Revises: 7c1e4a9d2b50
+Create Date: 2025-10-15 09:10:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4f8b2d6e1a93"
+down_revision = "7c1e4a9d2b50"
+branch_labels = None
+depends_on = None
+
+MASTER_TABLES = ["organization_v4", "domain_v4", "environment_v4", "audience_v4"]
+
+
+def upgrade() -> None:
+    # A B-tree on a boolean is too unselective to be used and still costs a write per row change;
+    # code lookups already go through the unique index on code
+    with op.get_context().autocommit_block():
+        for table in MASTER_TABLES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_is_active")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in MASTER_TABLES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_is_active ON {table} (is_active)")
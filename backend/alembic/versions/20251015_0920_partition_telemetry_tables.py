@@ -0,0 +1,98 @@
+"""partition telemetry tables
+
+Revision ID: 9a3d5c7e2f14
+Revises: 4f8b2d6e1a93
+Create Date: 2025-10-15 09:20:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9a3d5c7e2f14"
+down_revision = "4f8b2d6e1a93"
+branch_labels = None
+depends_on = None
+
+# table -> (partition key, (index name, index columns), non-generated columns to copy)
+TELEMETRY_TABLES = {
+    "otel_spans_v4": (
+        "start_time",
+        ("ix_otel_spans_v4_start_time_trace_id", "start_time, trace_id"),
+        "id, trace_id, span_id, parent_id, name, kind, start_time, end_time, status_code, service_name, "
+        "service_version, resource_attr, attributes, events, links, raw, ingested_at",
+    ),
+    "otel_logs_v4": (
+        '"time"',
+        ("ix_otel_logs_v4_time_trace_id", '"time", trace_id'),
+        'id, event_name, trace_id, span_id, trace_flags, "time", observed_time, severity_number, severity_text, '
+        "body_text, body_json, attributes, resource, dropped_attributes, raw, ingested_at",
+    ),
+    "otel_metrics_v4": (
+        "ts",
+        ("ix_otel_metrics_v4_ts_metric_name", "ts, metric_name"),
+        "id, metric_name, ts, resource_attrs, scope_attrs, data, ingested_at",
+    ),
+}
+
+
+def upgrade() -> None:
+    # Creates monthly partitions from the current month up to months_ahead; safe to call repeatedly,
+    # e.g. from the application at startup or from cron
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_monthly_partitions(parent text, months_ahead integer DEFAULT 3)
+        RETURNS void AS $$
+        DECLARE
+            month_start date := date_trunc('month', now())::date;
+            partition_name text;
+        BEGIN
+            FOR i IN 0..months_ahead LOOP
+                partition_name := parent || '_' || to_char(month_start, 'YYYY_MM');
+                BEGIN
+                    EXECUTE format(
+                        'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                        partition_name, parent, month_start, (month_start + interval '1 month')::date
+                    );
+                EXCEPTION WHEN others THEN
+                    -- Typically rows for this month already landed in the default partition
+                    RAISE NOTICE 'Could not create partition %: %', partition_name, SQLERRM;
+                END;
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    for table, (key, (index_name, index_columns), columns) in TELEMETRY_TABLES.items():
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_unpartitioned")
+        op.execute(f"ALTER TABLE {table}_unpartitioned RENAME CONSTRAINT {table}_pkey TO {table}_unpartitioned_pkey")
+        # The partition key must be part of the primary key
+        op.execute(f"""
+            CREATE TABLE {table} (
+                LIKE {table}_unpartitioned INCLUDING DEFAULTS INCLUDING GENERATED,
+                CONSTRAINT {table}_pkey PRIMARY KEY (id, {key})
+            ) PARTITION BY RANGE ({key})
+        """)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        op.execute(f"SELECT create_monthly_partitions('{table}')")
+        # Indexes on the parent are created on every partition
+        op.execute(f"CREATE INDEX {index_name} ON {table} ({index_columns})")
+        op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_unpartitioned")
+        op.execute(f"DROP TABLE {table}_unpartitioned")
+
+
+def downgrade() -> None:
+    for table, (_key, _index, columns) in TELEMETRY_TABLES.items():
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+        op.execute(f"ALTER TABLE {table}_partitioned RENAME CONSTRAINT {table}_pkey TO {table}_partitioned_pkey")
+        op.execute(f"""
+            CREATE TABLE {table} (
+                LIKE {table}_partitioned INCLUDING DEFAULTS INCLUDING GENERATED,
+                CONSTRAINT {table}_pkey PRIMARY KEY (id)
+            )
+        """)
+        op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_partitioned")
+        # Dropping the parent drops all of its partitions
+        op.execute(f"DROP TABLE {table}_partitioned")
+
+    op.execute("DROP FUNCTION IF EXISTS create_monthly_partitions(text, integer)")
@@ -0,0 +1,38 @@
+"""telemetry expression indexes
+
+Revision ID: 5e2b8f4a7c61
+Revises: 9a3d5c7e2f14
+Create Date: 2025-10-15 09:30:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5e2b8f4a7c61"
+down_revision = "9a3d5c7e2f14"
+branch_labels = None
+depends_on = None
+
+# (table, generated column, JSON path expression)
+JSON_EXTRACTIONS = [
+    ("otel_spans_v4", "operation_name", "(attributes->>'gen_ai.operation.name')"),
+    ("otel_spans_v4", "model_name", "(attributes->>'gen_ai.request.model')"),
+    ("otel_logs_v4", "service_name", "(resource->'attributes'->>'service.name')"),
+    ("otel_logs_v4", "code_function_name", "(attributes->>'code.function.name')"),
+]
+
+
+def upgrade() -> None:
+    # Index the JSON paths instead of materializing them as generated columns on every insert
+    for table, column, expression in JSON_EXTRACTIONS:
+        op.drop_column(table, column)
+        op.execute(f"CREATE INDEX ix_{table}_{column} ON {table} ({expression})")
+
+
+def downgrade() -> None:
+    for table, column, expression in JSON_EXTRACTIONS:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_{column}")
+        op.add_column(table, sa.Column(column, sa.Text(), sa.Computed(expression), nullable=True))
@@ -0,0 +1,53 @@
+"""drop updated_at triggers
+
+Revision ID: 3b7f1c9e5d28
+Revises: 5e2b8f4a7c61
+Create Date: 2025-10-15 09:40:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3b7f1c9e5d28"
+down_revision = "5e2b8f4a7c61"
+branch_labels = None
+depends_on = None
+
+UPDATED_AT_TABLES = [
+    "organization_v4",
+    "domain_v4",
+    "environment_v4",
+    "audience_v4",
+    "tenants_v4",
+    "users_v4",
+    "chat_sessions_v4",
+]
+
+
+def upgrade() -> None:
+    # updated_at is set by the ORM (onupdate=func.now()) as part of each UPDATE statement
+    for table in UPDATED_AT_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trigger_update_{table}_updated_at ON {table};")
+
+    op.execute("DROP FUNCTION IF EXISTS update_updated_at();")
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_updated_at()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.updated_at = NOW();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    for table in UPDATED_AT_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER trigger_update_{table}_updated_at
+            BEFORE UPDATE ON {table}
+            FOR EACH ROW
+            EXECUTE FUNCTION update_updated_at();
+        """)
@@ -0,0 +1,41 @@
+"""trigram search indexes
+
+Revision ID: 8d4c2a6f3e17
+Revises: 3b7f1c9e5d28
+Create Date: 2025-10-15 09:50:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8d4c2a6f3e17"
+down_revision = "3b7f1c9e5d28"
+branch_labels = None
+depends_on = None
+
+# (index name, table, expression) backing the admin ILIKE '%term%' searches.
+# UUID expressions match the CAST(... AS VARCHAR) emitted for .cast(String) in the routers.
+TRIGRAM_INDEXES = [
+    ("ix_users_v4_display_name_trgm", "users_v4", "display_name"),
+    ("ix_users_v4_upn_trgm", "users_v4", "upn"),
+    ("ix_users_v4_email_trgm", "users_v4", "email"),
+    ("ix_users_v4_oid_trgm", "users_v4", "(CAST(oid AS VARCHAR))"),
+    ("ix_tenants_v4_tenant_id_trgm", "tenants_v4", "(CAST(tenant_id AS VARCHAR))"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        for name, table, expression in TRIGRAM_INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING gin ({expression} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _table, _expression in TRIGRAM_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
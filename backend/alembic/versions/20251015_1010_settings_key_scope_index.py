@@ -0,0 +1,28 @@
+"""settings key scope index
+
+Revision ID: 1d6b9e4f7a35
+Revises: 8d4c2a6f3e17
+Create Date: 2025-10-15 10:10:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1d6b9e4f7a35"
+down_revision = "8d4c2a6f3e17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves the per-key lookups of settings resolution and the duplicate-scope check on create
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_settings_v4_key_scope_key ON settings_v4 (key, scope_key)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_settings_v4_key_scope_key")
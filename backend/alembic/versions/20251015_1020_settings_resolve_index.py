@@ -0,0 +1,30 @@
+"""settings resolve index
+
+Revision ID: 5c8a2e7d9b16
+Revises: 1d6b9e4f7a35
+Create Date: 2025-10-15 10:20:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5c8a2e7d9b16"
+down_revision = "1d6b9e4f7a35"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Matches resolve_setting's filter and ORDER BY so the best candidate is the first index entry per key
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_settings_v4_resolve "
+            "ON settings_v4 (key, specificity DESC NULLS LAST, updated_at DESC) "
+            "WHERE is_active AND NOT is_secret"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_settings_v4_resolve")
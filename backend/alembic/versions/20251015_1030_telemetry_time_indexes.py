@@ -0,0 +1,34 @@
+"""telemetry time indexes
+
+Revision ID: 2e7a4c9f1b53
+Revises: 5c8a2e7d9b16
+Create Date: 2025-10-15 10:30:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "2e7a4c9f1b53"
+down_revision = "5c8a2e7d9b16"
+branch_labels = None
+depends_on = None
+
+# (index name, table, index definition) for the overview's last-24h windows.
+# BRIN suits the append-only timestamp columns: a few pages per partition instead of a full B-tree.
+TIME_INDEXES = [
+    ("ix_otel_logs_v4_time_brin", "otel_logs_v4", 'USING brin ("time")'),
+    ("ix_otel_logs_v4_errors_time", "otel_logs_v4", '("time") WHERE severity_number >= 17'),
+    ("ix_otel_spans_v4_start_time_brin", "otel_spans_v4", "USING brin (start_time)"),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY is not supported on partitioned tables; the parent index cascades to every partition
+    for name, table, definition in TIME_INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} {definition}")
+
+
+def downgrade() -> None:
+    for name, _table, _definition in TIME_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,25 @@
+"""spans duration index
+
+Revision ID: 7b3f9d2e6a48
+Revises: 2e7a4c9f1b53
+Create Date: 2025-10-15 10:40:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7b3f9d2e6a48"
+down_revision = "2e7a4c9f1b53"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # duration_ms is already a stored generated column; index it so duration filters stop recomputing per row.
+    # CONCURRENTLY is not supported on partitioned tables.
+    op.execute("CREATE INDEX IF NOT EXISTS ix_otel_spans_v4_duration_ms ON otel_spans_v4 (duration_ms)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_otel_spans_v4_duration_ms")
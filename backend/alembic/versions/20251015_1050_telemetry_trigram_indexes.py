@@ -0,0 +1,34 @@
+"""telemetry trigram indexes
+
+Revision ID: 4d8e1a6c3f92
+Revises: 7b3f9d2e6a48
+Create Date: 2025-10-15 10:50:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4d8e1a6c3f92"
+down_revision = "7b3f9d2e6a48"
+branch_labels = None
+depends_on = None
+
+# (index name, table, column) backing the observability ILIKE '%term%' filters
+TRIGRAM_INDEXES = [
+    ("ix_otel_spans_v4_trace_id_trgm", "otel_spans_v4", "trace_id"),
+    ("ix_otel_metrics_v4_metric_name_trgm", "otel_metrics_v4", "metric_name"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CONCURRENTLY is not supported on partitioned tables; the parent index cascades to every partition
+    for name, table, column in TRIGRAM_INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    for name, _table, _column in TRIGRAM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
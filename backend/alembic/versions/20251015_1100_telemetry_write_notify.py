@@ -0,0 +1,43 @@
+"""telemetry write notify
+
+Revision ID: 8c5a3f7e2d19
+Revises: 4d8e1a6c3f92
+Create Date: 2025-10-15 11:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8c5a3f7e2d19"
+down_revision = "4d8e1a6c3f92"
+branch_labels = None
+depends_on = None
+
+TELEMETRY_TABLES = ["otel_logs_v4", "otel_spans_v4", "otel_metrics_v4"]
+
+
+def upgrade() -> None:
+    # Lets the API drop its cached observability overview as soon as telemetry changes.
+    # Statement-level so bulk ingest sends one notification per statement, not per row;
+    # identical notifications within a transaction are folded into one by PostgreSQL.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_obs_overview() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('obs_overview', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    for table in TELEMETRY_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_notify_obs_overview
+            AFTER INSERT OR DELETE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_obs_overview()
+        """)
+
+
+def downgrade() -> None:
+    for table in TELEMETRY_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_obs_overview ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_obs_overview()")
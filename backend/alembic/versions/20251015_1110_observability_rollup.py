@@ -0,0 +1,33 @@
+"""observability rollup
+
+Revision ID: 3f6b9e2a7c41
+Revises: 8c5a3f7e2d19
+Create Date: 2025-10-15 11:10:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f6b9e2a7c41"
+down_revision = "8c5a3f7e2d19"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rolling-window counters for the observability overview, refreshed in the background by the API
+    # so dashboard requests read a row instead of recounting the last 24h of telemetry.
+    op.create_table(
+        "observability_rollup_v4",
+        sa.Column("key", sa.Text(), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("observability_rollup_v4")
@@ -11,6 +11,7 @@ import pytest
 import pytest_asyncio
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
 from shared.database import Base, DatabaseConfig
 
@@ -41,13 +42,14 @@ def test_engine():
     return engine
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="session")
 async def test_async_engine():
-    """Create an async test database engine."""
+    """Create an async test database engine shared by the whole test session."""
     async_url, sync_url = get_test_database_urls()
-    engine = create_async_engine(async_url, echo=False)
+    # NullPool: the TestClient runs the app on its own event loop, so connections must not be reused across loops
+    engine = create_async_engine(async_url, echo=False, poolclass=NullPool)
 
-    # Create all tables if they don't exist
+    # Create all tables once per session
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
@@ -59,21 +61,40 @@ async def test_async_engine():
 
 @pytest_asyncio.fixture
 async def test_db_session(test_async_engine):
-    """Create a test database session."""
-    async_session = async_sessionmaker(test_async_engine, class_=AsyncSession, expire_on_commit=False)
+    """Create a test database session whose changes are rolled back after the test."""
+    async with test_async_engine.connect() as conn:
+        transaction = await conn.begin()
+        # Commits inside the test only release a savepoint; the outer transaction is rolled back
+        session = AsyncSession(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
+
 
-    async with async_session() as session:
-        yield session
+@pytest.fixture(scope="session")
+def _app_singleton(test_async_engine):
+    """Build the test FastAPI application once per session."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        # Set test environment variables to avoid database connections
+        monkeypatch.setenv("APP_MODE", "demo")
+        monkeypatch.setenv("DB_HOST", "localhost")
+        monkeypatch.setenv("DB_NAME", "test_db")
+        yield _build_test_app(test_async_engine)
 
 
 @pytest.fixture
-def test_app(monkeypatch, test_async_engine):
-    """Create a test FastAPI application."""
-    # Set test environment variables to avoid database connections
-    monkeypatch.setenv("APP_MODE", "demo")
-    monkeypatch.setenv("DB_HOST", "localhost")
-    monkeypatch.setenv("DB_NAME", "test_db")
+def test_app(_app_singleton):
+    """Provide the shared test application, restoring its dependency overrides afterwards."""
+    saved_overrides = dict(_app_singleton.dependency_overrides)
+    yield _app_singleton
+    _app_singleton.dependency_overrides.clear()
+    _app_singleton.dependency_overrides.update(saved_overrides)
 
+
+def _build_test_app(test_async_engine):
+    """Create a test FastAPI application."""
     # Create test database session maker
     async_session = async_sessionmaker(test_async_engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -94,11 +115,13 @@ def test_app(monkeypatch, test_async_engine):
 
     app = FastAPI(docs_url="/docs", redoc_url="/redoc", openapi_url="/openapi.json")
 
+    # Imported once per app build instead of on every request; load_build_info caches the file contents
+    from main import load_build_info
+
     # Add release ID header middleware for testing
     @app.middleware("http")
     async def add_release_id_header(request, call_next):
         response = await call_next(request)
-        from main import load_build_info
         build_info = load_build_info()
         response.headers["X-Release-Id"] = build_info["release_id"]
         return response
@@ -115,8 +138,6 @@ def test_app(monkeypatch, test_async_engine):
     # Add endpoints for testing
     @app.get("/api/version")
     async def get_version():
-        # Import build info functionality for testing
-        from main import load_build_info
         return load_build_info()
 
     @app.get("/api/health")
@@ -203,21 +224,25 @@ def test_app(monkeypatch, test_async_engine):
     return app
 
 
-@pytest.fixture
-def test_client(test_app):
-    """Create a test client."""
-    with TestClient(test_app) as client:
+@pytest.fixture(scope="session")
+def _client_singleton(_app_singleton):
+    """Open one test client (and its lifespan) for the whole session."""
+    with TestClient(_app_singleton) as client:
         yield client
 
 
+@pytest.fixture
+def test_client(test_app, _client_singleton):
+    """Provide the shared test client; test_app restores dependency overrides after the test."""
+    return _client_singleton
+
+
 @pytest_asyncio.fixture
-async def async_test_client(test_app):
+async def async_test_client(test_client):
     """Create an async test client."""
-    from fastapi.testclient import TestClient
-
     # Use the FastAPI test client which is actually synchronous
     # but wrap in async context for convenience
-    client = TestClient(test_app)
+    client = test_client
 
     # Create a simple async wrapper
     class AsyncTestClient:
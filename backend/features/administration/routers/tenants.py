@@ -1,22 +1,21 @@
 import logging
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request
 from sqlalchemy import String, func, select
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from features.administration.schemas import TenantV4Response
-from shared.auth import get_current_user
-from shared.database import get_db_session
+from shared.deps import CurrentUser, CurrentUserDict, DBSession
 from shared.models import TenantV4, UserV4
-from shared.utils import create_audit_log, get_user_dependency
+from shared.utils import count_rows, create_audit_log
 
 router = APIRouter(tags=["Tenants"])
 logger = logging.getLogger(__name__)
 
 
 def format_tenant_response(item):
-    return TenantV4Response(
+    # Values come straight from typed DB columns, so skip per-field validation
+    return TenantV4Response.model_construct(
         id=str(item.id),
         tenant_id=str(item.tenant_id),
         created_at=item.created_at.isoformat(),
@@ -27,8 +26,8 @@ def format_tenant_response(item):
 @router.get("/api/admin/tenants", response_model=list[TenantV4Response])
 async def get_tenants(
     request: Request,
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
     skip: int = 0,
     limit: int = 100,
     search: str | None = None,
@@ -56,26 +55,26 @@ async def get_tenants(
 
 @router.delete("/api/admin/tenants/{tenant_id}")
 async def delete_tenant(
-    tenant_id: str,
+    tenant_id: uuid.UUID,
     request: Request,
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     try:
-        tenant_uuid = uuid.UUID(tenant_id)
-
-        # Check if tenant exists
-        query = select(TenantV4).filter(TenantV4.id == tenant_uuid)
+        # Check if tenant exists and count its users in a single query
+        query = (
+            select(TenantV4, func.count(UserV4.id).label("users_count"))
+            .outerjoin(UserV4, UserV4.tenant_id == TenantV4.tenant_id)
+            .filter(TenantV4.id == tenant_id)
+            .group_by(TenantV4.id)
+        )
         result = await db.execute(query)
-        tenant = result.scalar_one_or_none()
+        row = result.first()
 
-        if not tenant:
+        if not row:
             raise HTTPException(status_code=404, detail="Tenant not found")
 
-        # Check if there are users associated with this tenant
-        users_count_query = select(func.count(UserV4.id)).filter(UserV4.tenant_id == tenant.tenant_id)
-        users_count_result = await db.execute(users_count_query)
-        users_count = users_count_result.scalar()
+        tenant, users_count = row
 
         if users_count > 0:
             raise HTTPException(
@@ -99,8 +98,6 @@ async def delete_tenant(
 
         return {"message": "Tenant deleted successfully"}
 
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid tenant ID format") from None
     except HTTPException:
         # Re-raise HTTPExceptions (like our 400 error) without modification
         raise
@@ -111,11 +108,15 @@ async def delete_tenant(
 
 @router.get("/api/admin/tenants/count")
 async def get_tenants_count(
-    _current_user: dict = Depends(get_user_dependency()),
-    db: AsyncSession = Depends(get_db_session),
+    _current_user: CurrentUserDict,
+    db: DBSession,
     search: str | None = None,
 ):
     try:
+        # Unfiltered totals come from planner statistics on large tables (approximate, see count_rows)
+        if not search:
+            return {"count": await count_rows(db, TenantV4)}
+
         query = select(func.count(TenantV4.id))
 
         # Add search filter
@@ -1,24 +1,62 @@
 import logging
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import String, and_, func, or_, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, and_, bindparam, delete, func, literal, or_, select, union_all
 
 from features.administration.schemas import UserV4Response, UserV4UpdateRequest
-from shared.auth import get_current_user
-from shared.database import get_db_session
-from shared.models import ChatMessageV4, ChatSessionV4, DomainV4, EnvironmentV4, OrganizationV4, TenantV4, UserV4
-from shared.utils import create_audit_log, get_user_dependency
+from shared.database import start_stream
+from shared.deps import CurrentUser, CurrentUserDict, DBSession, StreamDBSession
+from shared.models import ChatMessageV4, ChatSessionV4, DomainV4, EnvironmentV4, OrganizationV4, UserV4
+from shared.utils import count_rows, create_audit_log
 
 router = APIRouter(tags=["Users"])
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip when streaming list responses
+_STREAM_BATCH_SIZE = 100
+
+# Statements built once at import so every request reuses the same compiled shape
+_USERS_WITH_NAMES = (
+    select(
+        UserV4,
+        OrganizationV4.name.label("organization_name"),
+        DomainV4.name.label("domain_name"),
+        EnvironmentV4.name.label("environment_name"),
+    )
+    .outerjoin(OrganizationV4, UserV4.organization_id == OrganizationV4.id)
+    .outerjoin(DomainV4, UserV4.domain_id == DomainV4.id)
+    .outerjoin(EnvironmentV4, UserV4.environment_id == EnvironmentV4.id)
+)
+_ACTIVE_REFERENCE_NAMES = {
+    kind: select(model.name)
+    .filter(model.id == bindparam(f"{kind}_id"), model.is_active)
+    .limit(1)
+    .scalar_subquery()
+    .label(kind)
+    for kind, model in (("organization", OrganizationV4), ("domain", DomainV4), ("environment", EnvironmentV4))
+}
+
+
+def _user_search_condition(search: str):
+    """Condition matching users whose own identifiers contain the search term.
+
+    Substring matches, served by the gin_trgm_ops indexes on each column.
+    """
+    return or_(
+        UserV4.display_name.ilike(f"%{search}%"),
+        UserV4.upn.ilike(f"%{search}%"),
+        UserV4.email.ilike(f"%{search}%"),
+        UserV4.oid.cast(String).ilike(f"%{search}%"),
+    )
+
 
 def format_user_response(
     item, tenant_display_name=None, organization_name=None, domain_name=None, environment_name=None
 ):
-    return UserV4Response(
+    # Values come straight from typed DB columns, so skip per-field validation
+    return UserV4Response.model_construct(
         id=str(item.id),
         tenant_id=str(item.tenant_id),
         oid=str(item.oid),
@@ -44,90 +82,98 @@ def format_user_response(
 @router.get("/api/admin/users", response_model=list[UserV4Response])
 async def get_users(
     request: Request,
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: StreamDBSession,
     skip: int = 0,
     limit: int = 100,
     search: str | None = None,
-    tenant_id: str | None = None,
+    tenant_id: uuid.UUID | None = None,
 ):
     try:
-        # Build query with joins to get related names
-        query = (
-            select(
-                UserV4,
-                OrganizationV4.name.label("organization_name"),
-                DomainV4.name.label("domain_name"),
-                EnvironmentV4.name.label("environment_name"),
-            )
-            .join(TenantV4, UserV4.tenant_id == TenantV4.tenant_id)
-            .outerjoin(OrganizationV4, UserV4.organization_id == OrganizationV4.id)
-            .outerjoin(DomainV4, UserV4.domain_id == DomainV4.id)
-            .outerjoin(EnvironmentV4, UserV4.environment_id == EnvironmentV4.id)
-        )
+        query = _USERS_WITH_NAMES
 
         # Add filters
         filters = []
         if search:
-            filters.append(
-                or_(
-                    UserV4.display_name.ilike(f"%{search}%"),
-                    UserV4.upn.ilike(f"%{search}%"),
-                    UserV4.email.ilike(f"%{search}%"),
-                    UserV4.oid.cast(String).ilike(f"%{search}%"),
-                    OrganizationV4.name.ilike(f"%{search}%"),
-                    DomainV4.name.ilike(f"%{search}%"),
-                    EnvironmentV4.name.ilike(f"%{search}%"),
-                )
+            # One narrow branch per match source instead of an OR evaluated over the joined rows
+            matching_ids = union_all(
+                select(UserV4.id).filter(_user_search_condition(search)),
+                *(
+                    select(UserV4.id).join(model, reference == model.id).filter(model.name.ilike(f"%{search}%"))
+                    for model, reference in (
+                        (OrganizationV4, UserV4.organization_id),
+                        (DomainV4, UserV4.domain_id),
+                        (EnvironmentV4, UserV4.environment_id),
+                    )
+                ),
             )
+            filters.append(UserV4.id.in_(matching_ids))
 
         if tenant_id:
-            filters.append(UserV4.tenant_id == uuid.UUID(tenant_id))
+            filters.append(UserV4.tenant_id == tenant_id)
 
         if filters:
             query = query.filter(and_(*filters))
 
         query = query.order_by(UserV4.created_at.desc()).offset(skip).limit(limit)
-        result = await db.execute(query)
-        users_with_data = result.all()
-
-        await create_audit_log(
-            db, request, current_user, "list", "users_v4", "all", f"Retrieved {len(users_with_data)} users"
-        )
 
-        return [
-            format_user_response(user, organization_name, domain_name, environment_name)
-            for user, organization_name, domain_name, environment_name in users_with_data
-        ]
+        # Run the query before responding so a failure is still answered with a 500
+        batches = await start_stream(db, query, batch_size=_STREAM_BATCH_SIZE)
     except Exception as e:
+        await db.close()
         logger.error("Error retrieving users: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve users") from None
 
+    async def generate_users():
+        # The generator owns the stream session and closes it once the body is sent
+        count = 0
+        try:
+            yield "["
+            async for rows in batches:
+                chunk = ",".join(
+                    format_user_response(
+                        user,
+                        organization_name=organization_name,
+                        domain_name=domain_name,
+                        environment_name=environment_name,
+                    ).model_dump_json()
+                    for user, organization_name, domain_name, environment_name in rows
+                )
+                yield f",{chunk}" if count else chunk
+                count += len(rows)
+            yield "]"
+
+            await create_audit_log(db, request, current_user, "list", "users_v4", "all", f"Retrieved {count} users")
+        except Exception as e:
+            # Headers are already sent, so the truncated body is the only signal left to the client
+            logger.error("Error streaming users: %s", e)
+        finally:
+            await db.close()
+
+    return StreamingResponse(generate_users(), media_type="application/json")
+
 
 @router.get("/api/admin/users/count")
 async def get_users_count(
-    _current_user: dict = Depends(get_user_dependency()),
-    db: AsyncSession = Depends(get_db_session),
+    _current_user: CurrentUserDict,
+    db: DBSession,
     search: str | None = None,
-    tenant_id: str | None = None,
+    tenant_id: uuid.UUID | None = None,
 ):
     try:
-        query = select(func.count(UserV4.id)).join(TenantV4, UserV4.tenant_id == TenantV4.tenant_id)
+        # Unfiltered totals come from planner statistics on large tables (approximate, see count_rows)
+        if not search and not tenant_id:
+            return {"count": await count_rows(db, UserV4)}
+
+        query = select(func.count(UserV4.id))
 
         # Add filters
         filters = []
         if search:
-            filters.append(
-                or_(
-                    UserV4.display_name.ilike(f"%{search}%"),
-                    UserV4.upn.ilike(f"%{search}%"),
-                    UserV4.email.ilike(f"%{search}%"),
-                    UserV4.oid.cast(String).ilike(f"%{search}%"),
-                )
-            )
+            filters.append(_user_search_condition(search))
 
         if tenant_id:
-            filters.append(UserV4.tenant_id == uuid.UUID(tenant_id))
+            filters.append(UserV4.tenant_id == tenant_id)
 
         if filters:
             query = query.filter(and_(*filters))
@@ -143,87 +189,45 @@ async def get_users_count(
 
 @router.put("/api/admin/users/{user_id}", response_model=UserV4Response)
 async def update_user(
-    user_id: str,
+    user_id: uuid.UUID,
     request: Request,
     user_update: UserV4UpdateRequest,
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     try:
-        user_uuid = uuid.UUID(user_id)
-
-        # Get the user with related data
-        query = (
-            select(
-                UserV4,
-                OrganizationV4.name.label("organization_name"),
-                DomainV4.name.label("domain_name"),
-                EnvironmentV4.name.label("environment_name"),
-            )
-            .join(TenantV4, UserV4.tenant_id == TenantV4.tenant_id)
-            .outerjoin(OrganizationV4, UserV4.organization_id == OrganizationV4.id)
-            .outerjoin(DomainV4, UserV4.domain_id == DomainV4.id)
-            .outerjoin(EnvironmentV4, UserV4.environment_id == EnvironmentV4.id)
-            .filter(UserV4.id == user_uuid)
-        )
+        # Primary-key lookup; reference names for the response come from the validation query below
+        user = await db.get(UserV4, user_id)
 
-        result = await db.execute(query)
-        user_data = result.first()
-
-        if not user_data:
+        if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        user = user_data[0]
-
-        # Validate foreign key references if provided
-        if user_update.organization_id:
-            org_query = select(OrganizationV4).filter(
-                OrganizationV4.id == uuid.UUID(user_update.organization_id), OrganizationV4.is_active
-            )
-            org_result = await db.execute(org_query)
-            if not org_result.first():
-                raise HTTPException(status_code=400, detail="Invalid or inactive organization")
-
-        if user_update.domain_id:
-            domain_query = select(DomainV4).filter(DomainV4.id == uuid.UUID(user_update.domain_id), DomainV4.is_active)
-            domain_result = await db.execute(domain_query)
-            if not domain_result.first():
-                raise HTTPException(status_code=400, detail="Invalid or inactive domain")
-
-        if user_update.environment_id:
-            env_query = select(EnvironmentV4).filter(
-                EnvironmentV4.id == uuid.UUID(user_update.environment_id), EnvironmentV4.is_active
+        # Validate foreign key references if provided, fetching their names for the response in one round trip
+        references = {
+            "organization": user_update.organization_id,
+            "domain": user_update.domain_id,
+            "environment": user_update.environment_id,
+        }
+        lookups = {kind: reference_id for kind, reference_id in references.items() if reference_id}
+        names: dict[str, str | None] = dict.fromkeys(references)
+        if lookups:
+            names_result = await db.execute(
+                select(*(_ACTIVE_REFERENCE_NAMES[kind] for kind in lookups)),
+                {f"{kind}_id": reference_id for kind, reference_id in lookups.items()},
             )
-            env_result = await db.execute(env_query)
-            if not env_result.first():
-                raise HTTPException(status_code=400, detail="Invalid or inactive environment")
+            names.update(names_result.one()._mapping)
+            for kind in lookups:
+                if names[kind] is None:
+                    raise HTTPException(status_code=400, detail=f"Invalid or inactive {kind}")
 
         # Update user fields
-        user.organization_id = uuid.UUID(user_update.organization_id) if user_update.organization_id else None
-        user.domain_id = uuid.UUID(user_update.domain_id) if user_update.domain_id else None
-        user.environment_id = uuid.UUID(user_update.environment_id) if user_update.environment_id else None
+        user.organization_id = user_update.organization_id
+        user.domain_id = user_update.domain_id
+        user.environment_id = user_update.environment_id
 
         await db.commit()
         await db.refresh(user)
 
-        # Get updated data with names
-        updated_query = (
-            select(
-                UserV4,
-                OrganizationV4.name.label("organization_name"),
-                DomainV4.name.label("domain_name"),
-                EnvironmentV4.name.label("environment_name"),
-            )
-            .join(TenantV4, UserV4.tenant_id == TenantV4.tenant_id)
-            .outerjoin(OrganizationV4, UserV4.organization_id == OrganizationV4.id)
-            .outerjoin(DomainV4, UserV4.domain_id == DomainV4.id)
-            .outerjoin(EnvironmentV4, UserV4.environment_id == EnvironmentV4.id)
-            .filter(UserV4.id == user_uuid)
-        )
-
-        updated_result = await db.execute(updated_query)
-        updated_data = updated_result.first()
-
         await create_audit_log(
             db,
             request,
@@ -234,10 +238,13 @@ async def update_user(
             "Updated organization/domain/environment assignments",
         )
 
-        return format_user_response(*updated_data)
+        return format_user_response(
+            user,
+            organization_name=names["organization"],
+            domain_name=names["domain"],
+            environment_name=names["environment"],
+        )
 
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid user ID format") from None
     except HTTPException:
         # Re-raise HTTPExceptions without modification
         raise
@@ -248,35 +255,23 @@ async def update_user(
 
 @router.delete("/api/admin/users/{user_id}")
 async def delete_user(
-    user_id: str,
+    user_id: uuid.UUID,
     request: Request,
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     try:
-        user_uuid = uuid.UUID(user_id)
-
         # Check if user exists
-        query = select(UserV4).filter(UserV4.id == user_uuid)
-        result = await db.execute(query)
-        user = result.scalar_one_or_none()
+        user = await db.get(UserV4, user_id)
 
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        # Delete related chat messages first
-        messages_query = select(ChatMessageV4).filter(ChatMessageV4.user_id == user_uuid)
-        messages_result = await db.execute(messages_query)
-        messages = messages_result.scalars().all()
-        for message in messages:
-            await db.delete(message)
+        # Delete related chat messages first, in one statement without loading them
+        await db.execute(delete(ChatMessageV4).where(ChatMessageV4.user_id == user_id))
 
         # Delete related chat sessions
-        sessions_query = select(ChatSessionV4).filter(ChatSessionV4.user_id == user_uuid)
-        sessions_result = await db.execute(sessions_query)
-        sessions = sessions_result.scalars().all()
-        for session in sessions:
-            await db.delete(session)
+        await db.execute(delete(ChatSessionV4).where(ChatSessionV4.user_id == user_id))
 
         # Delete the user
         await db.delete(user)
@@ -294,8 +289,6 @@ async def delete_user(
 
         return {"message": "User deleted successfully"}
 
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid user ID format") from None
     except HTTPException:
         # Re-raise HTTPExceptions without modification
         raise
@@ -306,28 +299,28 @@ async def delete_user(
 
 @router.get("/api/admin/users/master-data-options")
 async def get_master_data_options(
-    _current_user: dict = Depends(get_user_dependency()),
-    db: AsyncSession = Depends(get_db_session),
+    _current_user: CurrentUserDict,
+    db: DBSession,
 ):
     try:
-        # Get active organizations
-        org_query = select(OrganizationV4).filter(OrganizationV4.is_active).order_by(OrganizationV4.name)
-        org_result = await db.execute(org_query)
-        organizations = [{"id": str(org.id), "name": org.name, "code": org.code} for org in org_result.scalars().all()]
-
-        # Get active domains
-        domain_query = select(DomainV4).filter(DomainV4.is_active).order_by(DomainV4.name)
-        domain_result = await db.execute(domain_query)
-        domains = [
-            {"id": str(domain.id), "name": domain.name, "code": domain.code} for domain in domain_result.scalars().all()
-        ]
-
-        # Get active environments
-        env_query = select(EnvironmentV4).filter(EnvironmentV4.is_active).order_by(EnvironmentV4.name)
-        env_result = await db.execute(env_query)
-        environments = [{"id": str(env.id), "name": env.name, "code": env.code} for env in env_result.scalars().all()]
-
-        return {"organizations": organizations, "domains": domains, "environments": environments}
+        # Get active organizations, domains and environments in one round trip
+        options_query = union_all(
+            *(
+                select(literal(kind).label("kind"), model.id, model.name, model.code).filter(model.is_active)
+                for kind, model in (
+                    ("organizations", OrganizationV4),
+                    ("domains", DomainV4),
+                    ("environments", EnvironmentV4),
+                )
+            )
+        ).order_by("kind", "name")
+        options_result = await db.execute(options_query)
+
+        options: dict[str, list[dict]] = {"organizations": [], "domains": [], "environments": []}
+        for kind, item_id, name, code in options_result:
+            options[kind].append({"id": str(item_id), "name": name, "code": code})
+
+        return options
     except Exception as e:
         logger.error("Error getting master data options: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get master data options") from None
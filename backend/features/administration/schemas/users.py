@@ -1,3 +1,5 @@
+import uuid
+
 from pydantic import BaseModel
 
 
@@ -9,8 +11,8 @@ class UserV4Response(BaseModel):
     display_name: str | None
     upn: str | None
     email: str | None
-    roles: list
-    groups: list
+    roles: list[str]
+    groups: list[str]
     last_login_at: str | None
     organization_id: str | None = None
     domain_id: str | None = None
@@ -27,6 +29,6 @@ class UserV4Response(BaseModel):
 
 
 class UserV4UpdateRequest(BaseModel):
-    organization_id: str | None = None
-    domain_id: str | None = None
-    environment_id: str | None = None
+    organization_id: uuid.UUID | None = None
+    domain_id: uuid.UUID | None = None
+    environment_id: uuid.UUID | None = None
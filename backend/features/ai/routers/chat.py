@@ -1,53 +1,94 @@
-import json
+import asyncio
+from collections.abc import AsyncIterator
 import logging
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse, StreamingResponse
-from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
 
 from ai_service import AIOptions, ai_service
 from features.ai.schemas import ChatRequest
-from shared.auth import get_current_user
-from shared.database import get_db_session
-from shared.models import AuditLogV4, UserV4
-from shared.utils import extract_user_info
+from shared.deps import CurrentUser, DBSession
+from shared.utils import create_audit_log, extract_user_info
 
 router = APIRouter(tags=["AI"])
 logger = logging.getLogger(__name__)
 
+# SSE framing, pre-encoded so each streamed chunk is two bytes concatenations
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = b"data: [DONE]\n\n"
+# Upper bound on SSE frames joined into one write when the model emits tokens faster than the client reads
+_SSE_MAX_COALESCED_FRAMES = 16
+
+
+def _encode_chunk(chunk: dict) -> bytes:
+    """Serialize a stream chunk straight to UTF-8 JSON bytes."""
+    # Tool results can carry non-str dict keys, which json.dumps coerced to strings; keep doing so
+    return orjson.dumps(chunk, option=orjson.OPT_NON_STR_KEYS)
+
+
+async def _coalesce_frames(frames: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Yield each frame joined with any frames already waiting behind it.
+
+    A producer task drains ``frames`` into a queue; the consumer never waits for more frames than
+    are ready, so the first token (and any isolated token) is still written immediately while bursts
+    share a single write.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    end = object()
+
+    async def produce():
+        try:
+            async for frame in frames:
+                queue.put_nowait(frame)
+        finally:
+            queue.put_nowait(end)
+
+    producer = asyncio.create_task(produce())
+    try:
+        finished = False
+        while not finished:
+            batch = [await queue.get()]
+            while len(batch) < _SSE_MAX_COALESCED_FRAMES and not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch[-1] is end:
+                batch.pop()
+                finished = True
+            if batch:
+                yield b"".join(batch)
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+
 
 @router.post("/api/ai/chat/completion")
 async def chat_completion_stream_v1(
     chat_request: ChatRequest,
     request: Request,
-    current_user: UserV4 = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     user_id, tenant_id = extract_user_info(current_user)
     user_name = current_user.display_name or current_user.upn
 
     try:
-        # Create audit log for chat request
-        client_ip = request.client.host if request.client else None
-        user_agent = request.headers.get("user-agent")
-
-        audit_log = AuditLogV4(
-            user_id=user_id,
-            action="chat_completion",
-            resource="api",
-            resource_id="chat",
-            details=f"Chat completion request with {len(chat_request.messages)} messages",
-            ip_address=client_ip,
-            user_agent=user_agent,
+        # Create audit log for chat request (queued for the batched writer when it is running)
+        await create_audit_log(
+            db,
+            request,
+            current_user,
+            "chat_completion",
+            "api",
+            "chat",
+            f"Chat completion request with {len(chat_request.messages)} messages",
         )
 
-        db.add(audit_log)
-        await db.commit()
-
         logger.info("Chat completion request from user: %s", user_name)
 
-        # Convert Pydantic models to dict format
-        messages = [{"role": msg.role, "content": msg.content} for msg in chat_request.messages]
+        # Convert Pydantic models to dict format in one pass through pydantic-core
+        messages = chat_request.model_dump(include={"messages"})["messages"]
 
         async def generate_stream():
             try:
@@ -66,11 +107,10 @@ async def chat_completion_stream_v1(
                 # Use AI service for streaming completion
                 async for chunk in ai_service.chat_completion_streaming(user_id, tenant_id, messages, options):
                     # Format as Server-Sent Events
-                    chunk_json = json.dumps(chunk, ensure_ascii=False)
-                    yield f"data: {chunk_json}\n\n"
+                    yield _SSE_PREFIX + _encode_chunk(chunk) + _SSE_SUFFIX
 
                 # Send final event to indicate completion
-                yield "data: [DONE]\n\n"
+                yield _SSE_DONE
 
             except Exception as e:
                 logger.error("Error in chat completion streaming: %s", e)
@@ -80,11 +120,11 @@ async def chat_completion_stream_v1(
                     "finish_reason": "error",
                     "role": "assistant",
                 }
-                yield f"data: {json.dumps(error_chunk, ensure_ascii=False)}\n\n"
-                yield "data: [DONE]\n\n"
+                yield _SSE_PREFIX + _encode_chunk(error_chunk) + _SSE_SUFFIX
+                yield _SSE_DONE
 
         return StreamingResponse(
-            generate_stream(),
+            _coalesce_frames(generate_stream()),
             media_type="text/plain",
             headers={
                 "Cache-Control": "no-cache",
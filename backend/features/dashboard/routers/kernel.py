@@ -1,24 +1,31 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException
 
 from ai_service import ai_service
-from shared.utils import get_user_dependency
+from shared.deps import CurrentUserDict
+from shared.utils import TTLCache
 
 router = APIRouter(tags=["Dashboard"])
 
 logger = logging.getLogger(__name__)
 
+# Dashboards poll this endpoint; serve a snapshot that is at most a couple of seconds old
+_metrics_cache = TTLCache(maxsize=1, ttl=2)
+
 
 @router.get("/api/dashboard/kernel/metrics")
 async def get_kernel_metrics(
-    _current_user: dict = Depends(get_user_dependency()),
+    _current_user: CurrentUserDict,
 ):
     """Get metrics about active Semantic Kernel instances."""
     try:
-        metrics = ai_service.get_kernel_metrics()
-        return JSONResponse(content=metrics)
+        metrics = _metrics_cache.get("metrics")
+        if metrics is None:
+            metrics = ai_service.get_kernel_metrics()
+            _metrics_cache.set("metrics", metrics)
+        # Serialized by the app's default response class (ORJSONResponse)
+        return metrics
     except Exception as e:
         logger.error("Error getting kernel metrics: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get kernel metrics") from None
@@ -1,10 +1,11 @@
 import logging
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import and_, or_, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, delete, exists, insert, or_, select, update
 
+from features.data_management.routers.shared import get_active_master_items
 from features.data_management.schemas import (
     SettingsResolveRequest,
     SettingsResolveResponse,
@@ -12,47 +13,43 @@ from features.data_management.schemas import (
     SettingsV4Response,
     SettingsV4Update,
 )
-from shared.auth import get_current_user
-from shared.database import get_db_session
+from shared.database import start_stream
+from shared.deps import CurrentUser, DBSession, StreamDBSession
 from shared.models import AudienceV4, DomainV4, EnvironmentV4, OrganizationV4, SettingsV4, UserV4
-from shared.utils import create_audit_log
+from shared.utils import create_audit_log, extract_user_id
 
 router = APIRouter(tags=["Settings"])
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip when streaming the settings list
+_STREAM_BATCH_SIZE = 500
+
+# All settings with their master-data names joined in, in display order
+_SETTINGS_WITH_NAMES = (
+    select(SettingsV4, OrganizationV4.name, DomainV4.name, EnvironmentV4.name, AudienceV4.name)
+    .outerjoin(OrganizationV4, SettingsV4.organization_id == OrganizationV4.id)
+    .outerjoin(DomainV4, SettingsV4.domain_id == DomainV4.id)
+    .outerjoin(EnvironmentV4, SettingsV4.environment_id == EnvironmentV4.id)
+    .outerjoin(AudienceV4, SettingsV4.audience_id == AudienceV4.id)
+    .order_by(SettingsV4.specificity.desc().nulls_last(), SettingsV4.key)
+)
+
+
+def _user_scope(column, oid: uuid.UUID):
+    """Scalar subquery for one scope column of the user with the given Entra ID object ID."""
+    return select(column).filter(UserV4.oid == oid).limit(1).scalar_subquery()
+
 
 @router.get("/api/dm/settings", response_model=list[SettingsV4Response])
 async def get_settings(
     request: Request,
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     try:
-        # Get all settings first
-        settings_result = await db.execute(
-            select(SettingsV4).order_by(SettingsV4.specificity.desc().nulls_last(), SettingsV4.key)
-        )
-        settings = settings_result.scalars().all()
-
-        # Get all master tables for name lookups
-        org_result = await db.execute(select(OrganizationV4))
-        domain_result = await db.execute(select(DomainV4))
-        env_result = await db.execute(select(EnvironmentV4))
-        aud_result = await db.execute(select(AudienceV4))
-
-        # Create lookup dictionaries
-        orgs = {str(org.id): org.name for org in org_result.scalars().all()}
-        domains = {str(domain.id): domain.name for domain in domain_result.scalars().all()}
-        envs = {str(env.id): env.name for env in env_result.scalars().all()}
-        auds = {str(aud.id): aud.name for aud in aud_result.scalars().all()}
-
-        settings_list = []
-        for setting in settings:
-            org_name = orgs.get(str(setting.organization_id)) if setting.organization_id else None
-            domain_name = domains.get(str(setting.domain_id)) if setting.domain_id else None
-            env_name = envs.get(str(setting.environment_id)) if setting.environment_id else None
-            aud_name = auds.get(str(setting.audience_id)) if setting.audience_id else None
-            settings_list.append(format_settings_response(setting, org_name, domain_name, env_name, aud_name))
+        result = await db.execute(_SETTINGS_WITH_NAMES)
+
+        settings_list = [format_settings_response(*row) for row in result]
 
         await create_audit_log(
             db, request, current_user, "list", "settings_v4", "all", f"Retrieved {len(settings_list)} settings"
@@ -64,18 +61,57 @@ async def get_settings(
         raise HTTPException(status_code=500, detail="Failed to retrieve settings") from None
 
 
+@router.get("/api/dm/settings/stream", response_model=list[SettingsV4Response])
+async def stream_settings(
+    request: Request,
+    current_user: CurrentUser,
+    db: StreamDBSession,
+):
+    """Same payload as GET /api/dm/settings, streamed as a JSON array for large setting sets."""
+    try:
+        # Run the query before responding so a failure is still answered with a 500
+        batches = await start_stream(db, _SETTINGS_WITH_NAMES, batch_size=_STREAM_BATCH_SIZE)
+    except Exception as e:
+        await db.close()
+        logger.error("Error retrieving settings: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to retrieve settings") from None
+
+    async def generate_settings():
+        # The generator owns the stream session and closes it once the body is sent
+        count = 0
+        try:
+            yield "["
+            async for rows in batches:
+                chunk = ",".join(format_settings_response(*row).model_dump_json() for row in rows)
+                yield f",{chunk}" if count else chunk
+                count += len(rows)
+            yield "]"
+
+            await create_audit_log(
+                db, request, current_user, "list", "settings_v4", "all", f"Retrieved {count} settings"
+            )
+        except Exception as e:
+            # Headers are already sent, so the truncated body is the only signal left to the client
+            logger.error("Error streaming settings: %s", e)
+        finally:
+            await db.close()
+
+    return StreamingResponse(generate_settings(), media_type="application/json")
+
+
 # Settings V4 helper functions
 def format_settings_response(item, organization_name=None, domain_name=None, environment_name=None, audience_name=None):
-    return SettingsV4Response(
+    # Values come straight from typed DB columns, so skip per-field validation
+    return SettingsV4Response.model_construct(
         id=str(item.id),
         key=item.key,
         payload=item.payload,
         description=item.description,
         is_secret=item.is_secret,
-        organization_id=str(item.organization_id) if item.organization_id else None,
-        domain_id=str(item.domain_id) if item.domain_id else None,
-        environment_id=str(item.environment_id) if item.environment_id else None,
-        audience_id=str(item.audience_id) if item.audience_id else None,
+        organization_id=item.organization_id,
+        domain_id=item.domain_id,
+        environment_id=item.environment_id,
+        audience_id=item.audience_id,
         specificity=item.specificity,
         scope_key=item.scope_key,
         version=item.version,
@@ -95,54 +131,47 @@ def format_settings_response(item, organization_name=None, domain_name=None, env
 async def create_setting(
     setting: SettingsV4Create,
     request: Request,
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     try:
+        # Scope references arrive as UUIDs parsed by the request schema
+        scope = {
+            "organization_id": setting.organization_id,
+            "domain_id": setting.domain_id,
+            "environment_id": setting.environment_id,
+            "audience_id": setting.audience_id,
+        }
+
         # Check if key already exists in same scope
         filters = [SettingsV4.key == setting.key]
-        if setting.organization_id:
-            filters.append(SettingsV4.organization_id == uuid.UUID(setting.organization_id))
-        else:
-            filters.append(SettingsV4.organization_id.is_(None))
-        if setting.domain_id:
-            filters.append(SettingsV4.domain_id == uuid.UUID(setting.domain_id))
-        else:
-            filters.append(SettingsV4.domain_id.is_(None))
-        if setting.environment_id:
-            filters.append(SettingsV4.environment_id == uuid.UUID(setting.environment_id))
-        else:
-            filters.append(SettingsV4.environment_id.is_(None))
-        if setting.audience_id:
-            filters.append(SettingsV4.audience_id == uuid.UUID(setting.audience_id))
-        else:
-            filters.append(SettingsV4.audience_id.is_(None))
-
-        result = await db.execute(select(SettingsV4).filter(and_(*filters)))
-        if result.scalars().first():
-            raise HTTPException(status_code=400, detail="Setting key already exists in this scope")
+        for field, value in scope.items():
+            column = getattr(SettingsV4, field)
+            filters.append(column == value if value else column.is_(None))
 
-        user_id = (
-            current_user.get("user_id") if isinstance(current_user, dict) else str(getattr(current_user, "oid", None))
-        )
+        result = await db.execute(select(exists().where(and_(*filters))))
+        if result.scalar():
+            raise HTTPException(status_code=400, detail="Setting key already exists in this scope")
 
-        new_setting = SettingsV4(
-            key=setting.key,
-            payload=setting.payload,
-            description=setting.description,
-            is_secret=setting.is_secret,
-            organization_id=uuid.UUID(setting.organization_id) if setting.organization_id else None,
-            domain_id=uuid.UUID(setting.domain_id) if setting.domain_id else None,
-            environment_id=uuid.UUID(setting.environment_id) if setting.environment_id else None,
-            audience_id=uuid.UUID(setting.audience_id) if setting.audience_id else None,
-            is_active=setting.is_active,
-            created_by=user_id,
-            updated_by=user_id,
+        user_id = extract_user_id(current_user)
+
+        # Insert and read back server-generated columns in a single round trip, instead of a refresh
+        result = await db.execute(
+            insert(SettingsV4)
+            .values(
+                key=setting.key,
+                payload=setting.payload,
+                description=setting.description,
+                is_secret=setting.is_secret,
+                **scope,
+                is_active=setting.is_active,
+                created_by=user_id,
+                updated_by=user_id,
+            )
+            .returning(SettingsV4)
         )
-
-        db.add(new_setting)
+        new_setting = result.scalar_one()
         await db.commit()
-        await db.refresh(new_setting)
 
         await create_audit_log(
             db,
@@ -168,31 +197,28 @@ async def update_setting(
     setting_id: str,
     setting: SettingsV4Update,
     request: Request,
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     try:
-        result = await db.execute(select(SettingsV4).filter(SettingsV4.id == uuid.UUID(setting_id)))
-        existing_setting = result.scalars().first()
-
-        if not existing_setting:
-            raise HTTPException(status_code=404, detail="Setting not found")
+        # Fields to update (scope references are already UUIDs)
+        update_data = setting.model_dump(exclude_unset=True)
 
-        # Update fields
-        update_data = setting.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            if field in ["organization_id", "domain_id", "environment_id", "audience_id"] and value:
-                setattr(existing_setting, field, uuid.UUID(value))
-            else:
-                setattr(existing_setting, field, value)
+        user_id = extract_user_id(current_user)
 
-        user_id = (
-            current_user.get("user_id") if isinstance(current_user, dict) else str(getattr(current_user, "oid", None))
+        # Update and read back the row in a single round trip
+        result = await db.execute(
+            update(SettingsV4)
+            .where(SettingsV4.id == uuid.UUID(setting_id))
+            .values(**update_data, updated_by=user_id)
+            .returning(SettingsV4)
         )
-        existing_setting.updated_by = user_id
+        existing_setting = result.scalar_one_or_none()
+
+        if not existing_setting:
+            raise HTTPException(status_code=404, detail="Setting not found")
 
         await db.commit()
-        await db.refresh(existing_setting)
 
         await create_audit_log(
             db,
@@ -217,17 +243,19 @@ async def update_setting(
 async def delete_setting(
     setting_id: str,
     request: Request,
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     try:
-        result = await db.execute(select(SettingsV4).filter(SettingsV4.id == uuid.UUID(setting_id)))
-        existing_setting = result.scalars().first()
+        # Delete and get the key for the audit log in a single round trip
+        result = await db.execute(
+            delete(SettingsV4).where(SettingsV4.id == uuid.UUID(setting_id)).returning(SettingsV4.key)
+        )
+        setting_key = result.scalar_one_or_none()
 
-        if not existing_setting:
+        if setting_key is None:
             raise HTTPException(status_code=404, detail="Setting not found")
 
-        await db.delete(existing_setting)
         await db.commit()
 
         await create_audit_log(
@@ -237,7 +265,7 @@ async def delete_setting(
             "delete",
             "settings_v4",
             setting_id,
-            f"Deleted setting: {existing_setting.key}",
+            f"Deleted setting: {setting_key}",
         )
 
         return {"message": "Setting deleted successfully"}
@@ -253,8 +281,8 @@ async def delete_setting(
 async def resolve_setting(
     resolve_request: SettingsResolveRequest,
     request: Request,
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     """
     Resolve settings using metadata-driven approach with priority:
@@ -271,24 +299,21 @@ async def resolve_setting(
 
         if oid:
             try:
-                user_result = await db.execute(
-                    select(UserV4.organization_id, UserV4.domain_id, UserV4.environment_id).filter(UserV4.oid == oid)
-                )
-                user_data = user_result.first()
-                if user_data:
-                    user_org_id, user_domain_id, user_env_id = user_data
-            except Exception as e:
-                logger.warning("Error fetching user metadata for oid '%s': %s", oid, e)
+                user_oid = uuid.UUID(oid)
+            except ValueError as e:
+                logger.warning("Invalid oid '%s' for settings resolution: %s", oid, e)
+            else:
+                # Resolve the user's scope inside the settings query instead of a separate round trip
+                user_org_id = _user_scope(UserV4.organization_id, user_oid)
+                user_domain_id = _user_scope(UserV4.domain_id, user_oid)
+                user_env_id = _user_scope(UserV4.environment_id, user_oid)
 
         # Get audience_id from audience_key
         audience_id = None
         if audience_key:
-            audience_result = await db.execute(
-                select(AudienceV4.id).filter(AudienceV4.code == audience_key, AudienceV4.is_active)
-            )
-            audience_data = audience_result.first()
-            if audience_data:
-                audience_id = audience_data[0]
+            audience = (await get_active_master_items(db, AudienceV4)).get(audience_key)
+            if audience:
+                audience_id = audience[0]
 
         # Single SQL query with proper filtering logic
         # This query finds the best matching setting based on scope hierarchy
@@ -1,18 +1,52 @@
 import logging
 import uuid
 
-from fastapi import HTTPException, Request
-from sqlalchemy import and_, select
+from fastapi import APIRouter, HTTPException, Request
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from features.data_management.schemas import MasterTableCreate, MasterTableResponse, MasterTableUpdate
-from shared.utils import create_audit_log
+from shared.deps import CurrentUser, CurrentUserDict, DBSession
+from shared.utils import TTLCache, create_audit_log, extract_user_id, stage_audit_log
 
 logger = logging.getLogger(__name__)
 
+# Master data changes rarely; keep each table's active rows in process and drop them on every write here.
+# The TTL bounds staleness from writes made by other worker processes.
+_active_items_cache = TTLCache(maxsize=16, ttl=60)
+
+
+async def get_active_master_items(db: AsyncSession, model_class) -> dict[str, tuple[uuid.UUID, str]]:
+    """Return {code: (id, name)} for the active rows of a master table, cached for a short TTL."""
+    items = _active_items_cache.get(model_class)
+    if items is None:
+        result = await db.execute(
+            select(model_class.code, model_class.id, model_class.name).filter(model_class.is_active)
+        )
+        items = {code: (item_id, name) for code, item_id, name in result}
+        _active_items_cache.set(model_class, items)
+    return items
+
+
+def master_table_columns(model_class) -> tuple:
+    """Columns read by format_master_table_response, for list queries that skip ORM hydration."""
+    return (
+        model_class.id,
+        model_class.code,
+        model_class.name,
+        model_class.description,
+        model_class.is_active,
+        model_class.created_by,
+        model_class.created_at,
+        model_class.updated_by,
+        model_class.updated_at,
+    )
+
 
 def format_master_table_response(item):
-    return MasterTableResponse(
+    # Values come straight from typed DB columns, so skip per-field validation
+    return MasterTableResponse.model_construct(
         id=str(item.id),
         code=item.code,
         name=item.name,
@@ -35,29 +69,30 @@ async def create_master_item(
 ):
     """Generic function to create master data items."""
     try:
-        # Check if code already exists
-        result = await db.execute(select(model_class).filter(model_class.code == item_data.code))
-        if result.scalars().first():
-            raise HTTPException(status_code=400, detail=f"{entity_name.capitalize()} code already exists")
+        user_id = extract_user_id(current_user)
 
-        user_id = (
-            current_user.get("user_id") if isinstance(current_user, dict) else str(getattr(current_user, "oid", None))
-        )
-
-        new_item = model_class(
-            code=item_data.code,
-            name=item_data.name,
-            description=item_data.description,
-            is_active=item_data.is_active,
-            created_by=user_id,
-            updated_by=user_id,
-        )
-
-        db.add(new_item)
-        await db.commit()
-        await db.refresh(new_item)
+        # Insert and read back server defaults (timestamps) in a single round trip, instead of a refresh;
+        # the unique constraint on code rejects duplicates
+        try:
+            result = await db.execute(
+                insert(model_class)
+                .values(
+                    code=item_data.code,
+                    name=item_data.name,
+                    description=item_data.description,
+                    is_active=item_data.is_active,
+                    created_by=user_id,
+                    updated_by=user_id,
+                )
+                .returning(model_class)
+            )
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail=f"{entity_name.capitalize()} code already exists") from None
+        new_item = result.scalar_one()
 
-        await create_audit_log(
+        # Audited in the same commit as the change
+        stage_audit_log(
             db,
             request,
             current_user,
@@ -66,6 +101,8 @@ async def create_master_item(
             str(new_item.id),
             f"Created {entity_name}: {item_data.name}",
         )
+        await db.commit()
+        _active_items_cache.pop(model_class)
 
         return format_master_table_response(new_item)
     except HTTPException:
@@ -87,35 +124,25 @@ async def update_master_item(
 ):
     """Generic function to update master data items."""
     try:
-        result = await db.execute(select(model_class).filter(model_class.id == uuid.UUID(item_id)))
-        existing_item = result.scalars().first()
+        user_id = extract_user_id(current_user)
 
-        if not existing_item:
-            raise HTTPException(status_code=404, detail=f"{entity_name.capitalize()} not found")
-
-        # Check if code already exists (excluding current item)
-        if item_data.code and item_data.code != existing_item.code:
+        # Update and read back the row in a single round trip; the unique constraint on code rejects duplicates
+        try:
             result = await db.execute(
-                select(model_class).filter(
-                    and_(model_class.code == item_data.code, model_class.id != uuid.UUID(item_id))
-                )
+                update(model_class)
+                .where(model_class.id == uuid.UUID(item_id))
+                .values(**item_data.model_dump(exclude_unset=True), updated_by=user_id)
+                .returning(model_class)
             )
-            if result.scalars().first():
-                raise HTTPException(status_code=400, detail=f"{entity_name.capitalize()} code already exists")
-
-        # Update fields
-        for field, value in item_data.dict(exclude_unset=True).items():
-            setattr(existing_item, field, value)
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail=f"{entity_name.capitalize()} code already exists") from None
+        existing_item = result.scalar_one_or_none()
 
-        user_id = (
-            current_user.get("user_id") if isinstance(current_user, dict) else str(getattr(current_user, "oid", None))
-        )
-        existing_item.updated_by = user_id
-
-        await db.commit()
-        await db.refresh(existing_item)
+        if not existing_item:
+            raise HTTPException(status_code=404, detail=f"{entity_name.capitalize()} not found")
 
-        await create_audit_log(
+        stage_audit_log(
             db,
             request,
             current_user,
@@ -124,6 +151,8 @@ async def update_master_item(
             item_id,
             f"Updated {entity_name}: {existing_item.name}",
         )
+        await db.commit()
+        _active_items_cache.pop(model_class)
 
         return format_master_table_response(existing_item)
     except HTTPException:
@@ -144,17 +173,15 @@ async def delete_master_item(
 ):
     """Generic function to delete master data items."""
     try:
-        result = await db.execute(select(model_class).filter(model_class.id == uuid.UUID(item_id)))
-        existing_item = result.scalars().first()
+        result = await db.execute(
+            delete(model_class).where(model_class.id == uuid.UUID(item_id)).returning(model_class.name)
+        )
+        item_name = result.scalar_one_or_none()
 
-        if not existing_item:
+        if item_name is None:
             raise HTTPException(status_code=404, detail=f"{entity_name.capitalize()} not found")
 
-        item_name = existing_item.name
-        await db.delete(existing_item)
-        await db.commit()
-
-        await create_audit_log(
+        stage_audit_log(
             db,
             request,
             current_user,
@@ -163,6 +190,8 @@ async def delete_master_item(
             item_id,
             f"Deleted {entity_name}: {item_name}",
         )
+        await db.commit()
+        _active_items_cache.pop(model_class)
 
         return {"message": f"{entity_name.capitalize()} deleted successfully"}
     except HTTPException:
@@ -171,3 +200,56 @@ async def delete_master_item(
         logger.error("Error deleting %s: %s", entity_name, e)
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to delete {entity_name}") from None
+
+
+def make_master_router(model_class, entity_name: str, plural_name: str) -> APIRouter:
+    """Build the list/create/update/delete router for a master data table under /api/dm/{entity_name}."""
+    router = APIRouter(tags=[entity_name.capitalize()])
+    path = f"/api/dm/{entity_name}"
+    table_name = f"{entity_name}_v4"
+
+    @router.get(path, response_model=list[MasterTableResponse], name=f"get_{plural_name}")
+    async def list_items(
+        request: Request,
+        current_user: CurrentUserDict,
+        db: DBSession,
+    ):
+        # Plain rows are enough for the response; skip ORM object hydration
+        result = await db.execute(select(*master_table_columns(model_class)).order_by(model_class.name))
+        items = result.all()
+
+        await create_audit_log(
+            db, request, current_user, "list", table_name, "all", f"Retrieved {len(items)} {plural_name}"
+        )
+
+        return [format_master_table_response(item) for item in items]
+
+    @router.post(path, response_model=MasterTableResponse, name=f"create_{entity_name}")
+    async def create_item(
+        item: MasterTableCreate,
+        request: Request,
+        current_user: CurrentUser,
+        db: DBSession,
+    ):
+        return await create_master_item(item, request, current_user, db, model_class, entity_name)
+
+    @router.put(f"{path}/{{item_id}}", response_model=MasterTableResponse, name=f"update_{entity_name}")
+    async def update_item(
+        item_id: str,
+        item: MasterTableUpdate,
+        request: Request,
+        current_user: CurrentUser,
+        db: DBSession,
+    ):
+        return await update_master_item(item_id, item, request, current_user, db, model_class, entity_name)
+
+    @router.delete(f"{path}/{{item_id}}", name=f"delete_{entity_name}")
+    async def delete_item(
+        item_id: str,
+        request: Request,
+        current_user: CurrentUser,
+        db: DBSession,
+    ):
+        return await delete_master_item(item_id, request, current_user, db, model_class, entity_name)
+
+    return router
@@ -1,3 +1,5 @@
+import uuid
+
 from pydantic import BaseModel
 
 
@@ -6,10 +8,10 @@ class SettingsV4Base(BaseModel):
     payload: dict | list | str | int | float | bool
     description: str | None = None
     is_secret: bool = False
-    organization_id: str | None = None
-    domain_id: str | None = None
-    environment_id: str | None = None
-    audience_id: str | None = None
+    organization_id: uuid.UUID | None = None
+    domain_id: uuid.UUID | None = None
+    environment_id: uuid.UUID | None = None
+    audience_id: uuid.UUID | None = None
     is_active: bool = True
 
 
@@ -22,10 +24,10 @@ class SettingsV4Update(BaseModel):
     payload: dict | list | str | int | float | bool | None = None
     description: str | None = None
     is_secret: bool | None = None
-    organization_id: str | None = None
-    domain_id: str | None = None
-    environment_id: str | None = None
-    audience_id: str | None = None
+    organization_id: uuid.UUID | None = None
+    domain_id: uuid.UUID | None = None
+    environment_id: uuid.UUID | None = None
+    audience_id: uuid.UUID | None = None
     is_active: bool | None = None
 
 
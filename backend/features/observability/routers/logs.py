@@ -1,71 +1,137 @@
+import json
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import lambda_stmt, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from shared.database import get_db_session
+from features.observability.routers.shared import TOTAL_COUNT, encode_cursor, parse_cursor
+from features.observability.schemas import LogEntry, LogsResponse
+from shared.database import get_stream_db_session, start_stream
 from shared.models import OtelLogsV4
-from shared.utils import get_user_dependency
+from shared.utils import TTLCache, get_user_dependency, iso_timestamp
 
 router = APIRouter(tags=["Observability Logs"])
 logger = logging.getLogger(__name__)
 
+# Polled dashboard views repeat the same filters; reuse a page for a few seconds
+_logs_cache = TTLCache(maxsize=64, ttl=5)
 
-@router.get("/api/observability/logs")
+# Rows fetched from the database per round trip while streaming the response
+_STREAM_BATCH_SIZE = 50
+# Largest page a client may request; later rows are reached through next_cursor
+_MAX_PAGE_SIZE = 1000
+
+# Only the columns the response needs (the raw OTLP record is never returned)
+_LOG_COLUMNS = (
+    OtelLogsV4.id,
+    iso_timestamp(OtelLogsV4.time).label("time_iso"),
+    OtelLogsV4.severity_number,
+    OtelLogsV4.severity_text,
+    OtelLogsV4.body_json,
+    OtelLogsV4.body_text,
+    OtelLogsV4.attributes,
+    OtelLogsV4.trace_id,
+    OtelLogsV4.span_id,
+    OtelLogsV4.resource,
+    # Extracted in SQL rather than walking the resource dict per row
+    OtelLogsV4.resource["scope"]["name"].astext.label("scope_name"),
+)
+
+
+def format_log_entry(log) -> LogEntry:
+    # Values come straight from typed DB columns, so skip per-field validation
+    return LogEntry.model_construct(
+        id=str(log.id),  # Convert UUID to string
+        time=log.time_iso,
+        severity_number=log.severity_number,
+        severity_text=log.severity_text,
+        body=log.body_json or log.body_text,
+        attributes=log.attributes or {},
+        trace_id_hex=log.trace_id,
+        span_id_hex=log.span_id,
+        resource_attributes=log.resource or {},
+        scope_name=log.scope_name,
+    )
+
+
+@router.get("/api/observability/logs", response_model=LogsResponse, response_class=StreamingResponse)
 async def get_observability_logs(
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=_MAX_PAGE_SIZE),
+    cursor: str | None = None,
     severity_min: int | None = None,
     trace_id: str | None = None,
     _current_user: dict = Depends(get_user_dependency()),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_stream_db_session),
 ):
     """Get observability logs with optional filtering."""
+    cursor_key = parse_cursor(cursor)
+
     try:
-        query = select(OtelLogsV4).order_by(OtelLogsV4.time.desc()).limit(limit)
+        cache_key = (limit, cursor, severity_min, trace_id)
+        cached = _logs_cache.get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
 
-        if severity_min is not None:
-            query = query.filter(OtelLogsV4.severity_number >= severity_min)
+        # Lambda statements are built once per filter combination and cached by code location,
+        # so repeat requests skip statement construction; the filter values bind as parameters
+        query = lambda_stmt(
+            lambda: select(*_LOG_COLUMNS).order_by(OtelLogsV4.time.desc(), OtelLogsV4.id.desc()).limit(limit)
+        )
 
-        if trace_id is not None:
-            query = query.filter(OtelLogsV4.trace_id == trace_id)
+        # Keyset pagination: continue after the last (timestamp, id) of the previous page instead of OFFSET;
+        # the id breaks ties between rows exported with the same timestamp
+        if cursor_key is not None:
+            cursor_time, cursor_id = cursor_key
+            query += lambda s: s.where(tuple_(OtelLogsV4.time, OtelLogsV4.id) < tuple_(cursor_time, cursor_id))
 
-        result = await db.execute(query)
-        logs = result.scalars().all()
+        # Only the first page reports the total: on a cursor page the window count would visit every
+        # matching row behind the cursor, undoing what keyset paging saves
+        if cursor_key is None:
+            query += lambda s: s.add_columns(TOTAL_COUNT)
 
-        # Count total matching logs
-        count_query = select(func.count(OtelLogsV4.id))
         if severity_min is not None:
-            count_query = count_query.filter(OtelLogsV4.severity_number >= severity_min)
+            query += lambda s: s.where(OtelLogsV4.severity_number >= severity_min)
+
         if trace_id is not None:
-            count_query = count_query.filter(OtelLogsV4.trace_id == trace_id)
-
-        count_result = await db.execute(count_query)
-        total_count = count_result.scalar()
-
-        response_logs = []
-        for log in logs:
-            log_entry = {
-                "id": str(log.id),  # Convert UUID to string
-                "time": log.time.isoformat() if log.time else None,
-                "severity_number": log.severity_number,
-                "severity_text": log.severity_text,
-                "body": log.body_json or log.body_text,
-                "attributes": log.attributes or {},
-                "trace_id_hex": log.trace_id,
-                "span_id_hex": log.span_id,
-                "resource_attributes": log.resource or {},
-                "scope_name": (log.resource or {}).get("scope", {}).get("name"),
-            }
-            response_logs.append(log_entry)
-
-        response = {
-            "logs": response_logs,
-            "count": total_count,
-        }
-
-        return response
+            query += lambda s: s.where(OtelLogsV4.trace_id == trace_id)
 
+        # Run the query before responding so a failure is still answered with a 500
+        batches = await start_stream(db, query, batch_size=_STREAM_BATCH_SIZE)
     except Exception as e:
+        await db.close()
         logger.exception("Error getting observability logs: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get observability logs") from e
+
+    async def generate_logs():
+        # The generator owns the stream session and closes it once the body is sent
+        parts = ['{"logs":[']
+        total_count = 0 if cursor_key is None else None
+        row_count = 0
+        last_row = None
+        try:
+            yield parts[0]
+            async for rows in batches:
+                chunk = ",".join(format_log_entry(log).model_dump_json() for log in rows)
+                if row_count:
+                    chunk = f",{chunk}"
+                elif total_count is not None:
+                    total_count = rows[0].total_count
+                row_count += len(rows)
+                last_row = rows[-1]
+                parts.append(chunk)
+                yield chunk
+            # A full page may have more rows behind it; hand back where to continue
+            next_cursor = encode_cursor(last_row.time_iso, last_row.id) if row_count == limit else None
+            parts.append(f'],"count":{json.dumps(total_count)},"next_cursor":{json.dumps(next_cursor)}}}')
+            yield parts[-1]
+
+            _logs_cache.set(cache_key, "".join(parts))
+        except Exception as e:
+            # Headers are already sent, so the truncated body is the only signal left to the client
+            logger.exception("Error streaming observability logs: %s", e)
+        finally:
+            await db.close()
+
+    return StreamingResponse(generate_logs(), media_type="application/json")
@@ -1,66 +1,135 @@
+import json
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import lambda_stmt, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from shared.database import get_db_session
+from features.observability.routers.shared import TOTAL_COUNT, encode_cursor, parse_cursor
+from features.observability.schemas import MetricEntry, MetricsResponse
+from shared.database import get_stream_db_session, start_stream
 from shared.models import OtelMetricsV4
-from shared.utils import get_user_dependency
+from shared.utils import TTLCache, get_user_dependency, iso_timestamp
 
 router = APIRouter(tags=["Observability Metrics"])
 logger = logging.getLogger(__name__)
 
+# Polled dashboard views repeat the same filters; reuse a page for a few seconds
+_metrics_cache = TTLCache(maxsize=64, ttl=5)
 
-@router.get("/api/observability/metrics")
+# Rows fetched from the database per round trip while streaming the response
+_STREAM_BATCH_SIZE = 50
+# Largest page a client may request; later rows are reached through next_cursor
+_MAX_PAGE_SIZE = 1000
+
+# Only the columns the response needs
+_METRIC_COLUMNS = (
+    OtelMetricsV4.id,
+    OtelMetricsV4.metric_name,
+    iso_timestamp(OtelMetricsV4.ts).label("ts_iso"),
+    OtelMetricsV4.resource_attrs,
+    OtelMetricsV4.scope_attrs,
+    # Extracted in SQL rather than walking the scope dict per row
+    OtelMetricsV4.scope_attrs["name"].astext.label("scope_name"),
+    OtelMetricsV4.data,
+)
+
+
+def format_metric_entry(metric) -> MetricEntry:
+    # Values come straight from typed DB columns, so skip per-field validation
+    return MetricEntry.model_construct(
+        id=str(metric.id),
+        name=metric.metric_name,
+        type="histogram",  # Default type based on structure
+        unit=None,  # Not stored in current model
+        description=None,  # Not stored in current model
+        latest_value=(metric.data or {}).get("sum", 0) if metric.data else 0,
+        latest_time=metric.ts_iso,
+        attributes={},  # Not stored separately in current model
+        resource_attributes=metric.resource_attrs or {},
+        scope_name=metric.scope_name,
+        data=metric.data,  # Include full data for histogram charts
+        ts=metric.ts_iso,
+        metric_name=metric.metric_name,
+        resource_attrs=metric.resource_attrs,
+        scope_attrs=metric.scope_attrs,
+    )
+
+
+@router.get("/api/observability/metrics", response_model=MetricsResponse, response_class=StreamingResponse)
 async def get_observability_metrics(
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=_MAX_PAGE_SIZE),
+    cursor: str | None = None,
     metric_name: str | None = None,
     _current_user: dict = Depends(get_user_dependency()),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_stream_db_session),
 ):
     """Get observability metrics with optional filtering."""
+    cursor_key = parse_cursor(cursor)
+
     try:
-        query = select(OtelMetricsV4).order_by(OtelMetricsV4.ts.desc()).limit(limit)
+        cache_key = (limit, cursor, metric_name)
+        cached = _metrics_cache.get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
 
-        if metric_name is not None:
-            query = query.filter(OtelMetricsV4.metric_name.ilike(f"%{metric_name}%"))
+        # Lambda statements are built once per filter combination and cached by code location,
+        # so repeat requests skip statement construction; the filter values bind as parameters
+        query = lambda_stmt(
+            lambda: select(*_METRIC_COLUMNS).order_by(OtelMetricsV4.ts.desc(), OtelMetricsV4.id.desc()).limit(limit)
+        )
+
+        # Keyset pagination: continue after the last (timestamp, id) of the previous page instead of OFFSET;
+        # the id breaks ties between rows exported with the same timestamp
+        if cursor_key is not None:
+            cursor_time, cursor_id = cursor_key
+            query += lambda s: s.where(tuple_(OtelMetricsV4.ts, OtelMetricsV4.id) < tuple_(cursor_time, cursor_id))
 
-        result = await db.execute(query)
-        metrics = result.scalars().all()
+        # Only the first page reports the total: on a cursor page the window count would visit every
+        # matching row behind the cursor, undoing what keyset paging saves
+        if cursor_key is None:
+            query += lambda s: s.add_columns(TOTAL_COUNT)
 
-        # Count total matching metrics
-        count_query = select(func.count(OtelMetricsV4.id))
         if metric_name is not None:
-            count_query = count_query.filter(OtelMetricsV4.metric_name.ilike(f"%{metric_name}%"))
-
-        count_result = await db.execute(count_query)
-        total_count = count_result.scalar()
-
-        return {
-            "metrics": [
-                {
-                    "id": str(metric.id),
-                    "name": metric.metric_name,
-                    "type": "histogram",  # Default type based on structure
-                    "unit": None,  # Not stored in current model
-                    "description": None,  # Not stored in current model
-                    "latest_value": (metric.data or {}).get("sum", 0) if metric.data else 0,
-                    "latest_time": metric.ts.isoformat() if metric.ts else None,
-                    "attributes": {},  # Not stored separately in current model
-                    "resource_attributes": metric.resource_attrs or {},
-                    "scope_name": (metric.scope_attrs or {}).get("name"),
-                    "data": metric.data,  # Include full data for histogram charts
-                    "ts": metric.ts.isoformat() if metric.ts else None,
-                    "metric_name": metric.metric_name,
-                    "resource_attrs": metric.resource_attrs,
-                    "scope_attrs": metric.scope_attrs,
-                }
-                for metric in metrics
-            ],
-            "count": total_count,
-        }
+            name_pattern = f"%{metric_name}%"
+            query += lambda s: s.where(OtelMetricsV4.metric_name.ilike(name_pattern))
 
+        # Run the query before responding so a failure is still answered with a 500
+        batches = await start_stream(db, query, batch_size=_STREAM_BATCH_SIZE)
     except Exception as e:
+        await db.close()
         logger.error("Error getting observability metrics: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get observability metrics") from None
+
+    async def generate_metrics():
+        # The generator owns the stream session and closes it once the body is sent
+        parts = ['{"metrics":[']
+        total_count = 0 if cursor_key is None else None
+        row_count = 0
+        last_row = None
+        try:
+            yield parts[0]
+            async for rows in batches:
+                chunk = ",".join(format_metric_entry(metric).model_dump_json() for metric in rows)
+                if row_count:
+                    chunk = f",{chunk}"
+                elif total_count is not None:
+                    total_count = rows[0].total_count
+                row_count += len(rows)
+                last_row = rows[-1]
+                parts.append(chunk)
+                yield chunk
+            # A full page may have more rows behind it; hand back where to continue
+            next_cursor = encode_cursor(last_row.ts_iso, last_row.id) if row_count == limit else None
+            parts.append(f'],"count":{json.dumps(total_count)},"next_cursor":{json.dumps(next_cursor)}}}')
+            yield parts[-1]
+
+            _metrics_cache.set(cache_key, "".join(parts))
+        except Exception as e:
+            # Headers are already sent, so the truncated body is the only signal left to the client
+            logger.error("Error streaming observability metrics: %s", e)
+        finally:
+            await db.close()
+
+    return StreamingResponse(generate_metrics(), media_type="application/json")
@@ -1,15 +1,155 @@
+import asyncio
+from contextlib import suppress
 import logging
+import time
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from shared.database import get_db_session
-from shared.utils import get_user_dependency
+from shared.database import db_manager, get_db_session
+from shared.utils import TTLCache, get_user_dependency
 
 router = APIRouter(tags=["Observability Overview"])
 logger = logging.getLogger(__name__)
 
+# Whole-table totals come from the planner's row estimate (pg_class.reltuples) once a table is large,
+# the same rule as shared.utils.count_rows; small or never-analyzed tables are still counted exactly.
+# The telemetry tables are partitioned and autovacuum never analyzes a partitioned parent (its
+# reltuples stays -1), so the estimate sums the partitions; a not-yet-analyzed partition counts as 0.
+_ESTIMATED_TOTAL = (
+    "(SELECT CASE WHEN s.estimate >= 10000 THEN s.estimate ELSE (SELECT COUNT(*) FROM {table}) END"
+    " FROM (SELECT SUM(GREATEST(c.reltuples, 0))::bigint AS estimate FROM pg_class c"
+    " WHERE c.oid = to_regclass('{table}')"
+    " OR c.oid IN (SELECT i.inhrelid FROM pg_inherits i WHERE i.inhparent = to_regclass('{table}'))) s)"
+)
+
+# Rolling 24h counters. Recounting the window on every request repeats the same scan, so a background
+# task materializes them into observability_rollup_v4 and the overview reads the stored values.
+_ROLLUP_COUNTS = {
+    # severity_number >= 17 is ERROR level
+    "recent_errors_24h": (
+        "SELECT COUNT(*) FROM otel_logs_v4 WHERE severity_number >= 17 AND time >= NOW() - INTERVAL '24 hours'"
+    ),
+    # Spans > 1 second duration
+    "slow_spans_24h": (
+        "SELECT COUNT(*) FROM otel_spans_v4 WHERE duration_ms > 1000 AND start_time >= NOW() - INTERVAL '24 hours'"
+    ),
+}
+
+_REFRESH_ROLLUPS_QUERY = text(
+    "INSERT INTO observability_rollup_v4 (key, value, updated_at) VALUES "
+    + ", ".join(f"('{key}', ({count}), NOW())" for key, count in _ROLLUP_COUNTS.items())
+    + " ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = EXCLUDED.updated_at"
+)
+
+# Rollups another worker refreshed within this window are left alone
+_FRESH_ROLLUPS_QUERY = text(
+    "SELECT COUNT(*) FROM observability_rollup_v4 WHERE updated_at > NOW() - make_interval(secs => :max_age)"
+)
+
+# Seconds between rollup refreshes; stored values may lag live telemetry by up to this long
+_ROLLUP_REFRESH_INTERVAL = 60.0
+
+# A rollup that has not been written yet (fresh database) falls back to counting live;
+# COALESCE only evaluates the fallback when the stored value is missing
+_ROLLUP_COLUMNS = ", ".join(
+    f"COALESCE((SELECT value FROM observability_rollup_v4 WHERE key = '{key}'), ({count})) AS {key}"
+    for key, count in _ROLLUP_COUNTS.items()
+)
+
+# All overview counts in one statement: one round trip, one parse, one snapshot
+_OVERVIEW_QUERY = text(f"""
+    SELECT
+        {_ESTIMATED_TOTAL.format(table="otel_logs_v4")} AS total_logs,
+        {_ESTIMATED_TOTAL.format(table="otel_spans_v4")} AS total_spans,
+        {_ESTIMATED_TOTAL.format(table="otel_metrics_v4")} AS total_metrics,
+        {_ROLLUP_COLUMNS}
+""")
+
+# Dashboards poll the overview. A cached overview is reused until telemetry is written (see the
+# obs_overview NOTIFY trigger), but for at least _MIN_OVERVIEW_AGE seconds so continuous ingest
+# recomputes it at most that often; the TTL still bounds staleness if notifications stop arriving
+# and picks up refreshed rollups.
+_overview_cache = TTLCache(maxsize=1, ttl=30)
+_MIN_OVERVIEW_AGE = 5.0
+_OVERVIEW_CHANNEL = "obs_overview"
+# Seconds before reconnecting after the listening connection fails
+_LISTENER_RETRY_DELAY = 5.0
+
+_last_telemetry_write = 0.0
+_background_tasks: list[asyncio.Task] = []
+
+
+def _on_telemetry_write(*_args) -> None:
+    global _last_telemetry_write
+    _last_telemetry_write = time.monotonic()
+
+
+async def _listen_for_telemetry_writes():
+    """Hold one connection LISTENing on the overview channel, reconnecting whenever it is lost."""
+    while True:
+        try:
+            async with db_manager.engine.connect() as conn:
+                raw_connection = await conn.get_raw_connection()
+                driver_connection = raw_connection.driver_connection
+                connection_lost = asyncio.Event()
+
+                def on_connection_lost(_conn, lost=connection_lost):
+                    lost.set()
+
+                driver_connection.add_termination_listener(on_connection_lost)
+                await driver_connection.add_listener(_OVERVIEW_CHANNEL, _on_telemetry_write)
+                # Writes may have been missed while not listening
+                _on_telemetry_write()
+                try:
+                    await connection_lost.wait()
+                finally:
+                    with suppress(Exception):
+                        await driver_connection.remove_listener(_OVERVIEW_CHANNEL, _on_telemetry_write)
+                    driver_connection.remove_termination_listener(on_connection_lost)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Observability overview listener failed: %s", e)
+        _on_telemetry_write()
+        await asyncio.sleep(_LISTENER_RETRY_DELAY)
+
+
+async def _refresh_rollups_periodically():
+    """Recompute the rolling-window counters every _ROLLUP_REFRESH_INTERVAL seconds."""
+    while True:
+        try:
+            async with db_manager.engine.begin() as conn:
+                fresh = await conn.scalar(_FRESH_ROLLUPS_QUERY, {"max_age": _ROLLUP_REFRESH_INTERVAL / 2})
+                if fresh < len(_ROLLUP_COUNTS):
+                    await conn.execute(_REFRESH_ROLLUPS_QUERY)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Observability rollup refresh failed: %s", e)
+        await asyncio.sleep(_ROLLUP_REFRESH_INTERVAL)
+
+
+def start_overview_tasks():
+    """Start the overview background tasks: cache invalidation on telemetry writes and rollup refreshes.
+
+    Requires an initialized database.
+    """
+    if not _background_tasks:
+        _background_tasks.append(asyncio.create_task(_listen_for_telemetry_writes()))
+        _background_tasks.append(asyncio.create_task(_refresh_rollups_periodically()))
+
+
+async def stop_overview_tasks():
+    """Stop the overview background tasks."""
+    for task in _background_tasks:
+        task.cancel()
+    for task in _background_tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+    _background_tasks.clear()
+
 
 @router.get("/api/observability/overview")
 async def get_observability_overview(
@@ -18,45 +158,21 @@ async def get_observability_overview(
 ):
     """Get observability overview statistics."""
     try:
-        # Get total counts
-        total_logs_result = await db.execute(text("SELECT COUNT(*) FROM otel_logs_v4"))
-        total_logs = total_logs_result.scalar()
-
-        total_spans_result = await db.execute(text("SELECT COUNT(*) FROM otel_spans_v4"))
-        total_spans = total_spans_result.scalar()
-
-        total_metrics_result = await db.execute(text("SELECT COUNT(*) FROM otel_metrics_v4"))
-        total_metrics = total_metrics_result.scalar()
-
-        # Get recent errors (24h) - severity_number >= 17 is ERROR level
-        recent_errors_result = await db.execute(
-            text("""
-            SELECT COUNT(*) FROM otel_logs_v4
-            WHERE severity_number >= 17
-            AND time >= NOW() - INTERVAL '24 hours'
-        """)
-        )
-        recent_errors_24h = recent_errors_result.scalar()
-
-        # Get slow spans (24h) - spans > 1 second duration
-        slow_spans_result = await db.execute(
-            text("""
-            SELECT COUNT(*) FROM otel_spans_v4
-            WHERE EXTRACT(EPOCH FROM (end_time - start_time)) > 1.0
-            AND start_time >= NOW() - INTERVAL '24 hours'
-        """)
-        )
-        slow_spans_24h = slow_spans_result.scalar()
-
-        overview = {
-            "total_logs": total_logs or 0,
-            "total_spans": total_spans or 0,
-            "total_metrics": total_metrics or 0,
-            "recent_errors_24h": recent_errors_24h or 0,
-            "slow_spans_24h": slow_spans_24h or 0,
-        }
-
-        return {"overview": overview}
+        cached = _overview_cache.get("overview")
+        if cached is not None:
+            computed_at, response = cached
+            if computed_at > _last_telemetry_write or time.monotonic() - computed_at < _MIN_OVERVIEW_AGE:
+                return response
+
+        computed_at = time.monotonic()
+        result = await db.execute(_OVERVIEW_QUERY)
+        counts = result.one()._mapping
+
+        overview = {name: count or 0 for name, count in counts.items()}
+        response = {"overview": overview}
+        _overview_cache.set("overview", (computed_at, response))
+
+        return response
 
     except Exception as e:
         logger.error("Error getting observability overview: %s", e)
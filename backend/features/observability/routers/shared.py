@@ -0,0 +1,26 @@
+"""Keyset pagination shared by the observability listing routers."""
+
+from datetime import datetime
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy import func
+
+# Total matching rows as a window count riding along with the page, saving a separate COUNT round trip
+TOTAL_COUNT = func.count().over().label("total_count")
+
+
+def encode_cursor(time_iso: str, row_id) -> str:
+    """Opaque cursor for the last row of a page: its timestamp and id, which break timestamp ties."""
+    return f"{time_iso}_{row_id}"
+
+
+def parse_cursor(cursor: str | None) -> tuple[datetime, uuid.UUID] | None:
+    """Decode a cursor made by encode_cursor into (time, id); a malformed cursor is a 400."""
+    if cursor is None:
+        return None
+    time_part, _, id_part = cursor.rpartition("_")
+    try:
+        return datetime.fromisoformat(time_part), uuid.UUID(id_part)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
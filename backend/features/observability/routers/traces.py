@@ -1,85 +1,151 @@
+import json
 import logging
+import re
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, select, text
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import lambda_stmt, select, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from shared.database import get_db_session
+from features.observability.routers.shared import TOTAL_COUNT, encode_cursor, parse_cursor
+from features.observability.schemas import TraceEntry, TracesResponse
+from shared.database import get_stream_db_session, start_stream
 from shared.models import OtelSpansV4
-from shared.utils import get_user_dependency
+from shared.utils import get_user_dependency, iso_timestamp
 
 router = APIRouter(tags=["Observability Traces"])
 logger = logging.getLogger(__name__)
 
+# A complete W3C trace id (stored as lowercase hex) is matched exactly instead of by substring
+_FULL_TRACE_ID = re.compile(r"[0-9a-fA-F]{32}")
 
-@router.get("/api/observability/traces")
+# Rows fetched from the database per round trip while streaming the response
+_STREAM_BATCH_SIZE = 50
+# Largest page a client may request; later rows are reached through next_cursor
+_MAX_PAGE_SIZE = 1000
+
+# Only the columns the response needs (the raw OTLP record, events and links are never returned)
+_SPAN_COLUMNS = (
+    OtelSpansV4.id,
+    OtelSpansV4.trace_id,
+    OtelSpansV4.span_id,
+    OtelSpansV4.parent_id,
+    OtelSpansV4.name,
+    OtelSpansV4.kind,
+    iso_timestamp(OtelSpansV4.start_time).label("start_time_iso"),
+    iso_timestamp(OtelSpansV4.end_time).label("end_time_iso"),
+    OtelSpansV4.duration_ms,
+    OtelSpansV4.status_code,
+    OtelSpansV4.attributes,
+    OtelSpansV4.resource_attr,
+    OtelSpansV4.service_name,
+)
+
+# Literal JSON path so the planner can use the ix_otel_spans_v4_operation_name expression index
+_OPERATION_FILTER = text("(attributes->>'gen_ai.operation.name') = :operation_name")
+
+
+def format_trace_entry(span) -> TraceEntry:
+    # Values come straight from typed DB columns, so skip per-field validation
+    return TraceEntry.model_construct(
+        id=span.id,
+        trace_id_hex=span.trace_id,
+        span_id_hex=span.span_id,
+        parent_span_id_hex=span.parent_id,
+        name=span.name,
+        kind=span.kind,
+        start_time=span.start_time_iso,
+        end_time=span.end_time_iso,
+        duration_ms=float(span.duration_ms) if span.duration_ms is not None else 0.0,
+        status_code=span.status_code,
+        status_message=None,  # Not stored in current model
+        attributes=span.attributes or {},
+        resource_attributes=span.resource_attr or {},
+        scope_name=span.service_name,
+    )
+
+
+@router.get("/api/observability/traces", response_model=TracesResponse, response_class=StreamingResponse)
 async def get_observability_traces(
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=_MAX_PAGE_SIZE),
+    cursor: str | None = None,
     min_duration_ms: int | None = None,
     status_code: str | None = None,
     trace_id: str | None = None,
+    operation_name: str | None = None,
     _current_user: dict = Depends(get_user_dependency()),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_stream_db_session),
 ):
     """Get observability traces with optional filtering."""
+    cursor_key = parse_cursor(cursor)
+
     try:
-        query = select(OtelSpansV4).order_by(OtelSpansV4.start_time.desc()).limit(limit)
+        # Lambda statements are built once per filter combination and cached by code location,
+        # so repeat requests skip statement construction; the filter values bind as parameters
+        query = lambda_stmt(
+            lambda: select(*_SPAN_COLUMNS).order_by(OtelSpansV4.start_time.desc(), OtelSpansV4.id.desc()).limit(limit)
+        )
+        params = {}
+
+        # Keyset pagination: continue after the last (timestamp, id) of the previous page instead of OFFSET;
+        # the id breaks ties between rows exported with the same timestamp
+        if cursor_key is not None:
+            cursor_time, cursor_id = cursor_key
+            query += lambda s: s.where(tuple_(OtelSpansV4.start_time, OtelSpansV4.id) < tuple_(cursor_time, cursor_id))
+
+        # Only the first page reports the total: on a cursor page the window count would visit every
+        # matching row behind the cursor, undoing what keyset paging saves
+        if cursor_key is None:
+            query += lambda s: s.add_columns(TOTAL_COUNT)
 
         if min_duration_ms is not None:
-            query = query.filter(text("EXTRACT(EPOCH FROM (end_time - start_time)) * 1000 >= :min_duration")).params(
-                min_duration=min_duration_ms
-            )
+            query += lambda s: s.where(OtelSpansV4.duration_ms >= min_duration_ms)
 
         if status_code is not None:
-            query = query.filter(OtelSpansV4.status_code == status_code)
+            query += lambda s: s.where(OtelSpansV4.status_code == status_code)
 
         if trace_id is not None:
-            query = query.filter(OtelSpansV4.trace_id.ilike(f"%{trace_id}%"))
+            if _FULL_TRACE_ID.fullmatch(trace_id):
+                full_trace_id = trace_id.lower()
+                query += lambda s: s.where(OtelSpansV4.trace_id == full_trace_id)
+            else:
+                trace_id_pattern = f"%{trace_id}%"
+                query += lambda s: s.where(OtelSpansV4.trace_id.ilike(trace_id_pattern))
 
-        result = await db.execute(query)
-        spans = result.scalars().all()
-
-        # Count total matching spans
-        count_query = select(func.count(OtelSpansV4.id))
-        if min_duration_ms is not None:
-            count_query = count_query.filter(
-                text("EXTRACT(EPOCH FROM (end_time - start_time)) * 1000 >= :min_duration")
-            ).params(min_duration=min_duration_ms)
-        if status_code is not None:
-            count_query = count_query.filter(OtelSpansV4.status_code == status_code)
-        if trace_id is not None:
-            count_query = count_query.filter(OtelSpansV4.trace_id.ilike(f"%{trace_id}%"))
-
-        count_result = await db.execute(count_query)
-        total_count = count_result.scalar()
-
-        return {
-            "traces": [
-                {
-                    "id": span.id,
-                    "trace_id_hex": span.trace_id,
-                    "span_id_hex": span.span_id,
-                    "parent_span_id_hex": span.parent_id,
-                    "name": span.name,
-                    "kind": span.kind,
-                    "start_time": span.start_time.isoformat() if span.start_time else None,
-                    "end_time": span.end_time.isoformat() if span.end_time else None,
-                    "duration_ms": (
-                        (span.end_time - span.start_time).total_seconds() * 1000
-                        if span.start_time and span.end_time
-                        else 0
-                    ),
-                    "status_code": span.status_code,
-                    "status_message": None,  # Not stored in current model
-                    "attributes": span.attributes or {},
-                    "resource_attributes": span.resource_attr or {},
-                    "scope_name": span.service_name,
-                }
-                for span in spans
-            ],
-            "count": total_count,
-        }
+        if operation_name is not None:
+            query += lambda s: s.where(_OPERATION_FILTER)
+            params["operation_name"] = operation_name
 
+        # Run the query before responding so a failure is still answered with a 500
+        batches = await start_stream(db, query, params, batch_size=_STREAM_BATCH_SIZE)
     except Exception as e:
+        await db.close()
         logger.error("Error getting observability traces: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get observability traces") from None
+
+    async def generate_traces():
+        # The generator owns the stream session and closes it once the body is sent
+        total_count = 0 if cursor_key is None else None
+        row_count = 0
+        last_row = None
+        try:
+            yield '{"traces":['
+            async for rows in batches:
+                chunk = ",".join(format_trace_entry(span).model_dump_json() for span in rows)
+                if row_count:
+                    chunk = f",{chunk}"
+                elif total_count is not None:
+                    total_count = rows[0].total_count
+                row_count += len(rows)
+                last_row = rows[-1]
+                yield chunk
+            # A full page may have more rows behind it; hand back where to continue
+            next_cursor = encode_cursor(last_row.start_time_iso, last_row.id) if row_count == limit else None
+            yield f'],"count":{json.dumps(total_count)},"next_cursor":{json.dumps(next_cursor)}}}'
+        except Exception as e:
+            # Headers are already sent, so the truncated body is the only signal left to the client
+            logger.error("Error streaming observability traces: %s", e)
+        finally:
+            await db.close()
+
+    return StreamingResponse(generate_traces(), media_type="application/json")
@@ -0,0 +1,10 @@
+from .telemetry import LogEntry, LogsResponse, MetricEntry, MetricsResponse, TraceEntry, TracesResponse
+
+__all__ = [
+    "LogEntry",
+    "LogsResponse",
+    "MetricEntry",
+    "MetricsResponse",
+    "TraceEntry",
+    "TracesResponse",
+]
@@ -0,0 +1,73 @@
+from typing import Any
+import uuid
+
+from pydantic import BaseModel
+
+
+class LogEntry(BaseModel):
+    id: str
+    time: str | None
+    severity_number: int | None
+    severity_text: str | None
+    body: Any
+    attributes: dict[str, Any]
+    trace_id_hex: str | None
+    span_id_hex: str | None
+    resource_attributes: dict[str, Any]
+    scope_name: str | None
+
+
+class LogsResponse(BaseModel):
+    logs: list[LogEntry]
+    # Total matching rows; only reported on the first page (no cursor)
+    count: int | None
+    next_cursor: str | None = None
+
+
+class MetricEntry(BaseModel):
+    id: str
+    name: str
+    type: str
+    unit: str | None
+    description: str | None
+    latest_value: Any
+    latest_time: str | None
+    attributes: dict[str, Any]
+    resource_attributes: dict[str, Any]
+    scope_name: str | None
+    data: Any
+    ts: str | None
+    metric_name: str
+    resource_attrs: dict[str, Any] | None
+    scope_attrs: dict[str, Any] | None
+
+
+class MetricsResponse(BaseModel):
+    metrics: list[MetricEntry]
+    # Total matching rows; only reported on the first page (no cursor)
+    count: int | None
+    next_cursor: str | None = None
+
+
+class TraceEntry(BaseModel):
+    id: uuid.UUID
+    trace_id_hex: str
+    span_id_hex: str
+    parent_span_id_hex: str | None
+    name: str
+    kind: str | None
+    start_time: str | None
+    end_time: str | None
+    duration_ms: float
+    status_code: str | None
+    status_message: str | None
+    attributes: dict[str, Any]
+    resource_attributes: dict[str, Any]
+    scope_name: str | None
+
+
+class TracesResponse(BaseModel):
+    traces: list[TraceEntry]
+    # Total matching rows; only reported on the first page (no cursor)
+    count: int | None
+    next_cursor: str | None = None
@@ -1,8 +1,7 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import and_, func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, HTTPException
+from sqlalchemy import and_, delete, func, insert, select, update
 
 from ai_service import ai_service
 from features.playground.schemas import (
@@ -12,20 +11,58 @@ from features.playground.schemas import (
     ChatSessionCreateRequest,
     ChatSessionResponse,
 )
-from shared.auth import get_current_user
-from shared.database import get_db_session
-from shared.models import AuditLogV4, ChatMessageV4, ChatSessionV4, UserV4
+from shared.deps import CurrentUser, DBSession
+from shared.models import AuditLogV4, ChatMessageV4, ChatSessionV4
 from shared.utils import extract_user_info
 
 router = APIRouter(tags=["Playground"])
 logger = logging.getLogger(__name__)
 
 
+def format_chat_session_response(session):
+    # Values come straight from typed DB columns, so skip per-field validation
+    return ChatSessionResponse.model_construct(
+        id=str(session.id),
+        user_id=str(session.user_id),
+        title=session.title,
+        created_at=session.created_at.isoformat(),
+        updated_at=session.updated_at.isoformat(),
+    )
+
+
+def format_chat_message_response(message):
+    # Values come straight from typed DB columns, so skip per-field validation
+    return ChatMessageResponse.model_construct(
+        id=str(message.id),
+        session_id=str(message.session_id),
+        user_id=str(message.user_id) if message.user_id else None,
+        role=message.role,
+        content=message.content,
+        metadata=message.message_metadata,
+        created_at=message.created_at.isoformat(),
+    )
+
+
+def _owned_session(session_id, user_id):
+    """Match the chat session only if it belongs to the given user."""
+    return and_(ChatSessionV4.id == session_id, ChatSessionV4.user_id == user_id)
+
+
+def _new_message_values(session_id, user_id, message_request):
+    return {
+        "session_id": session_id,
+        "user_id": user_id if message_request.role == "user" else None,
+        "role": message_request.role,
+        "content": message_request.content,
+        "message_metadata": message_request.metadata or {},
+    }
+
+
 # Chat sessions endpoints
 @router.get("/api/playground/sessions", response_model=list[ChatSessionResponse])
 async def get_chat_sessions(
-    current_user: UserV4 = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     """Get all chat sessions for the current user."""
     try:
@@ -36,16 +73,7 @@ async def get_chat_sessions(
         result = await db.execute(stmt)
         sessions = result.scalars().all()
 
-        return [
-            ChatSessionResponse(
-                id=str(session.id),
-                user_id=str(session.user_id),
-                title=session.title,
-                created_at=session.created_at.isoformat(),
-                updated_at=session.updated_at.isoformat(),
-            )
-            for session in sessions
-        ]
+        return [format_chat_session_response(session) for session in sessions]
     except Exception as e:
         logger.error("Error getting chat sessions: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get chat sessions") from None
@@ -54,8 +82,8 @@ async def get_chat_sessions(
 @router.post("/api/playground/sessions", response_model=ChatSessionResponse)
 async def create_chat_session(
     session_request: ChatSessionCreateRequest,
-    current_user: UserV4 = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     """Create a new chat session."""
     try:
@@ -71,13 +99,7 @@ async def create_chat_session(
         await db.commit()
         await db.refresh(new_session)
 
-        return ChatSessionResponse(
-            id=str(new_session.id),
-            user_id=str(new_session.user_id),
-            title=new_session.title,
-            created_at=new_session.created_at.isoformat(),
-            updated_at=new_session.updated_at.isoformat(),
-        )
+        return format_chat_session_response(new_session)
     except Exception as e:
         logger.error("Error creating chat session: %s", e)
         await db.rollback()
@@ -87,41 +109,31 @@ async def create_chat_session(
 @router.get("/api/playground/sessions/{session_id}/messages", response_model=list[ChatMessageResponse])
 async def get_chat_messages(
     session_id: str,
-    current_user: UserV4 = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     """Get all messages for a specific chat session."""
     try:
         # Use the user's actual ID for database operations
         user_id = current_user.id
 
-        # Verify session belongs to current user
-        session_stmt = select(ChatSessionV4).where(
-            and_(ChatSessionV4.id == session_id, ChatSessionV4.user_id == user_id)
+        # Ownership check and message fetch in one query: the session outer-joins its messages, so an
+        # owned session without messages still yields one row (with no message) and a foreign one none
+        stmt = (
+            select(ChatSessionV4.id, ChatMessageV4)
+            .outerjoin(ChatMessageV4, ChatMessageV4.session_id == ChatSessionV4.id)
+            .where(_owned_session(session_id, user_id))
+            .order_by(ChatMessageV4.created_at)
         )
-        session_result = await db.execute(session_stmt)
-        session = session_result.scalar_one_or_none()
+        result = await db.execute(stmt)
+        rows = result.all()
 
-        if not session:
+        if not rows:
             raise HTTPException(status_code=404, detail="Chat session not found")
 
-        # Get messages
-        stmt = select(ChatMessageV4).where(ChatMessageV4.session_id == session_id).order_by(ChatMessageV4.created_at)
-        result = await db.execute(stmt)
-        messages = result.scalars().all()
-
-        return [
-            ChatMessageResponse(
-                id=str(message.id),
-                session_id=str(message.session_id),
-                user_id=str(message.user_id) if message.user_id else None,
-                role=message.role,
-                content=message.content,
-                metadata=message.message_metadata,
-                created_at=message.created_at.isoformat(),
-            )
-            for message in messages
-        ]
+        messages = [row.ChatMessageV4 for row in rows if row.ChatMessageV4 is not None]
+
+        return [format_chat_message_response(message) for message in messages]
     except HTTPException:
         raise
     except Exception as e:
@@ -133,50 +145,32 @@ async def get_chat_messages(
 async def create_chat_message(
     session_id: str,
     message_request: ChatMessageCreateRequest,
-    current_user: UserV4 = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     """Save a chat message to a session."""
     try:
         # Use the user's actual ID for database operations
         user_id = current_user.id
 
-        # Verify session belongs to current user
-        session_stmt = select(ChatSessionV4).where(
-            and_(ChatSessionV4.id == session_id, ChatSessionV4.user_id == user_id)
+        # Bump the session's updated_at; the ownership filter makes this the ownership check as well
+        session_result = await db.execute(
+            update(ChatSessionV4)
+            .where(_owned_session(session_id, user_id))
+            .values(updated_at=func.now())
+            .returning(ChatSessionV4.id)
         )
-        session_result = await db.execute(session_stmt)
-        session = session_result.scalar_one_or_none()
-
-        if not session:
+        if session_result.scalar_one_or_none() is None:
             raise HTTPException(status_code=404, detail="Chat session not found")
 
         # Create message
-        new_message = ChatMessageV4(
-            session_id=session_id,
-            user_id=user_id if message_request.role == "user" else None,
-            role=message_request.role,
-            content=message_request.content,
-            message_metadata=message_request.metadata or {},
-        )
-
-        db.add(new_message)
-
-        # Update session updated_at
-        session.updated_at = func.now()
+        message_values = _new_message_values(session_id, user_id, message_request)
+        result = await db.execute(insert(ChatMessageV4).values(**message_values).returning(ChatMessageV4))
+        new_message = result.scalar_one()
 
         await db.commit()
-        await db.refresh(new_message)
-
-        return ChatMessageResponse(
-            id=str(new_message.id),
-            session_id=str(new_message.session_id),
-            user_id=str(new_message.user_id) if new_message.user_id else None,
-            role=new_message.role,
-            content=new_message.content,
-            metadata=new_message.message_metadata,
-            created_at=new_message.created_at.isoformat(),
-        )
+
+        return format_chat_message_response(new_message)
     except HTTPException:
         raise
     except Exception as e:
@@ -188,8 +182,8 @@ async def create_chat_message(
 @router.put("/api/playground/sessions/{session_id}/title")
 async def update_chat_session_title(
     session_id: str,
-    current_user: UserV4 = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     """Generate and update a session title based on the conversation."""
     try:
@@ -197,26 +191,21 @@ async def update_chat_session_title(
         user_id = current_user.id
         user_id_str, tenant_id = extract_user_info(current_user)
 
-        # Verify session belongs to current user
-        session_stmt = select(ChatSessionV4).where(
-            and_(ChatSessionV4.id == session_id, ChatSessionV4.user_id == user_id)
-        )
-        session_result = await db.execute(session_stmt)
-        session = session_result.scalar_one_or_none()
-
-        if not session:
-            raise HTTPException(status_code=404, detail="Chat session not found")
-
-        # Get first few messages to generate title
+        # Ownership check and first few messages (to generate the title from) in one query
         stmt = (
-            select(ChatMessageV4)
-            .where(ChatMessageV4.session_id == session_id)
+            select(ChatSessionV4.id, ChatMessageV4)
+            .outerjoin(ChatMessageV4, ChatMessageV4.session_id == ChatSessionV4.id)
+            .where(_owned_session(session_id, user_id))
             .order_by(ChatMessageV4.created_at)
             .limit(4)
         )
         result = await db.execute(stmt)
-        messages = result.scalars().all()
+        rows = result.all()
 
+        if not rows:
+            raise HTTPException(status_code=404, detail="Chat session not found")
+
+        messages = [row.ChatMessageV4 for row in rows if row.ChatMessageV4 is not None]
         if not messages:
             raise HTTPException(status_code=400, detail="No messages found in session")
 
@@ -239,7 +228,7 @@ async def update_chat_session_title(
                 generated_title = "Chat Session"
 
         # Update session title
-        session.title = generated_title
+        await db.execute(update(ChatSessionV4).where(ChatSessionV4.id == session_id).values(title=generated_title))
         await db.commit()
 
         return {"title": generated_title}
@@ -257,81 +246,52 @@ async def edit_chat_message(
     session_id: str,
     message_id: str,
     message_request: ChatMessageEditRequest,
-    current_user: UserV4 = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     """Edit a chat message and delete all subsequent messages."""
     try:
         user_id = current_user.id
 
-        # Verify session belongs to current user
-        session_stmt = select(ChatSessionV4).where(
-            and_(ChatSessionV4.id == session_id, ChatSessionV4.user_id == user_id)
+        # Ownership check and lookup of the edited message in one query; an owned session without
+        # that message yields a row with no created_at
+        lookup_stmt = (
+            select(ChatSessionV4.id, ChatMessageV4.created_at)
+            .outerjoin(
+                ChatMessageV4,
+                and_(ChatMessageV4.session_id == ChatSessionV4.id, ChatMessageV4.id == message_id),
+            )
+            .where(_owned_session(session_id, user_id))
         )
-        session_result = await db.execute(session_stmt)
-        session = session_result.scalar_one_or_none()
+        lookup_result = await db.execute(lookup_stmt)
+        lookup = lookup_result.one_or_none()
 
-        if not session:
+        if lookup is None:
             raise HTTPException(status_code=404, detail="Chat session not found")
-
-        # Find the message being edited
-        message_stmt = select(ChatMessageV4).where(
-            and_(ChatMessageV4.id == message_id, ChatMessageV4.session_id == session_id)
-        )
-        message_result = await db.execute(message_stmt)
-        message_to_edit = message_result.scalar_one_or_none()
-
-        if not message_to_edit:
+        if lookup.created_at is None:
             raise HTTPException(status_code=404, detail="Message not found")
 
-        # Get all messages in the session ordered by creation time
-        all_messages_stmt = (
-            select(ChatMessageV4).where(ChatMessageV4.session_id == session_id).order_by(ChatMessageV4.created_at)
+        # Delete the edited message and everything after it in one statement
+        await db.execute(
+            delete(ChatMessageV4).where(
+                and_(
+                    ChatMessageV4.session_id == session_id,
+                    ChatMessageV4.created_at >= lookup.created_at,
+                )
+            )
         )
-        all_messages_result = await db.execute(all_messages_stmt)
-        all_messages = all_messages_result.scalars().all()
-
-        # Find the index of the message being edited
-        edit_index = None
-        for i, msg in enumerate(all_messages):
-            if str(msg.id) == message_id:
-                edit_index = i
-                break
-
-        if edit_index is None:
-            raise HTTPException(status_code=404, detail="Message not found in session")
-
-        # Delete all messages from the edited message onwards
-        messages_to_delete = all_messages[edit_index:]
-        for msg in messages_to_delete:
-            await db.delete(msg)
 
         # Create new edited message
-        new_message = ChatMessageV4(
-            session_id=session_id,
-            user_id=user_id if message_request.role == "user" else None,
-            role=message_request.role,
-            content=message_request.content,
-            message_metadata=message_request.metadata or {},
-        )
-
-        db.add(new_message)
+        message_values = _new_message_values(session_id, user_id, message_request)
+        result = await db.execute(insert(ChatMessageV4).values(**message_values).returning(ChatMessageV4))
+        new_message = result.scalar_one()
 
         # Update session updated_at
-        session.updated_at = func.now()
+        await db.execute(update(ChatSessionV4).where(ChatSessionV4.id == session_id).values(updated_at=func.now()))
 
         await db.commit()
-        await db.refresh(new_message)
-
-        return ChatMessageResponse(
-            id=str(new_message.id),
-            session_id=str(new_message.session_id),
-            user_id=str(new_message.user_id) if new_message.user_id else None,
-            role=new_message.role,
-            content=new_message.content,
-            metadata=new_message.message_metadata,
-            created_at=new_message.created_at.isoformat(),
-        )
+
+        return format_chat_message_response(new_message)
     except HTTPException:
         raise
     except Exception as e:
@@ -343,8 +303,8 @@ async def edit_chat_message(
 @router.delete("/api/playground/sessions/{session_id}")
 async def delete_chat_session(
     session_id: str,
-    current_user: UserV4 = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser,
+    db: DBSession,
 ):
     """Delete a chat session and all its messages."""
     try:
@@ -352,26 +312,21 @@ async def delete_chat_session(
         user_id = current_user.id
         user_id_str, _ = extract_user_info(current_user)
 
-        # Verify session belongs to current user
-        session_stmt = select(ChatSessionV4).where(
-            and_(ChatSessionV4.id == session_id, ChatSessionV4.user_id == user_id)
+        # Delete the session only if it belongs to the current user; the database cascades the delete to
+        # its messages, and RETURNING counts them from the statement snapshot (taken before the cascade)
+        message_count_subquery = (
+            select(func.count())
+            .where(ChatMessageV4.session_id == ChatSessionV4.id)
+            .correlate(ChatSessionV4)
+            .scalar_subquery()
         )
-        session_result = await db.execute(session_stmt)
-        session = session_result.scalar_one_or_none()
+        delete_stmt = delete(ChatSessionV4).where(_owned_session(session_id, user_id)).returning(message_count_subquery)
+        result = await db.execute(delete_stmt)
+        message_count = result.scalar_one_or_none()
 
-        if not session:
+        if message_count is None:
             raise HTTPException(status_code=404, detail="Chat session not found")
 
-        # Delete all messages in the session first
-        delete_messages_stmt = select(ChatMessageV4).where(ChatMessageV4.session_id == session_id)
-        messages_result = await db.execute(delete_messages_stmt)
-        messages = messages_result.scalars().all()
-
-        for message in messages:
-            await db.delete(message)
-
-        # Delete the session
-        await db.delete(session)
         await db.commit()
 
         # Create audit log
@@ -380,7 +335,7 @@ async def delete_chat_session(
             action="delete_chat_session",
             resource="chat_session",
             resource_id=session_id,
-            details=f"Deleted chat session with {len(messages)} messages",
+            details=f"Deleted chat session with {message_count} messages",
         )
         db.add(audit_log)
         await db.commit()
@@ -5,12 +5,15 @@ from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager, suppress
 from datetime import datetime, timedelta
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 import uuid
 
 from plugin_manager import plugin_manager
 from semantic_kernel_setup import SemanticKernelManager
 
+if TYPE_CHECKING:
+    from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +29,8 @@ class UserKernel:
         self.access_count = 0
         self.kernel_manager = SemanticKernelManager(plugin_manager=plugin_manager)
         self.is_active = True
+        # Chat completion service of this kernel, resolved once at construction
+        self.azure_chat_completion: AzureChatCompletion = self.kernel_manager.chat_completion
 
     async def initialize(self):
         """Initialize the kernel and register plugins."""
@@ -126,9 +131,12 @@ class KernelManager:
                 await kernel.cleanup()
                 del self._kernels[user_id]
 
-    @asynccontextmanager
-    async def get_kernel(self, user_id: str, tenant_id: str) -> AsyncGenerator[UserKernel, None]:
-        """Get or create a kernel for a user with automatic lifecycle management."""
+    async def acquire_kernel(self, user_id: str, tenant_id: str) -> UserKernel:
+        """Get or create a kernel for a user.
+
+        Hot paths use this with release_kernel in a try/finally instead of the get_kernel
+        context manager; every acquire must be paired with a release.
+        """
         # Normalize user_id to ensure consistency across different calls
         normalized_user_id = str(user_id).strip()
 
@@ -150,18 +158,33 @@ class KernelManager:
 
         # Update access time
         kernel.update_access()
+        return kernel
+
+    async def release_kernel(self, user_kernel: UserKernel, error: Exception | None = None):
+        """Release a kernel obtained from acquire_kernel, passing the error raised while using it, if any."""
+        if error is None:
+            return
+
+        normalized_user_id = user_kernel.user_id
+        logger.error("Error using kernel for user %s: %s", normalized_user_id, error)
+        # Consider removing the kernel if there's a critical error
+        if isinstance(error, RuntimeError | ConnectionError):
+            async with self._lock:
+                if self._kernels.get(normalized_user_id) is user_kernel:
+                    await user_kernel.cleanup()
+                    del self._kernels[normalized_user_id]
 
+    @asynccontextmanager
+    async def get_kernel(self, user_id: str, tenant_id: str) -> AsyncGenerator[UserKernel, None]:
+        """Get or create a kernel for a user with automatic lifecycle management."""
+        kernel = await self.acquire_kernel(user_id, tenant_id)
         try:
             yield kernel
         except Exception as e:
-            logger.error("Error using kernel for user %s: %s", normalized_user_id, e)
-            # Consider removing the kernel if there's a critical error
-            if isinstance(e, RuntimeError | ConnectionError):
-                async with self._lock:
-                    if normalized_user_id in self._kernels:
-                        await self._kernels[normalized_user_id].cleanup()
-                        del self._kernels[normalized_user_id]
+            await self.release_kernel(kernel, e)
             raise
+        else:
+            await self.release_kernel(kernel)
 
     async def remove_kernel(self, user_id: str):
         """Manually remove a user's kernel."""
@@ -11,7 +11,7 @@ import tomllib
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import yaml
 
@@ -25,7 +25,8 @@ from features.observability.routers import logs, metrics, overview, traces
 from features.playground import playground_router
 from kernel_manager import kernel_manager
 from shared.database import db_manager
-from telemetry_config import setup_telemetry, shutdown_telemetry
+from shared.utils import start_audit_log_writer, stop_audit_log_writer
+from telemetry_config import ensure_telemetry_partitions, setup_telemetry, shutdown_telemetry
 
 # Load environment variables
 load_dotenv()
@@ -36,6 +37,9 @@ DOCS_URL = "/docs" if APP_MODE == "development" else None
 REDOC_URL = "/redoc" if APP_MODE == "development" else None
 OPENAPI_URL = "/openapi.json" if APP_MODE == "development" else None
 
+# Serialize responses with orjson (a declared dependency) rather than the stdlib encoder
+DEFAULT_RESPONSE_CLASS = ORJSONResponse
+
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
@@ -50,6 +54,9 @@ async def lifespan(_app: FastAPI):
 
         # Initialize database
         await db_manager.initialize()
+        await ensure_telemetry_partitions()
+        start_audit_log_writer()
+        overview.start_overview_tasks()
 
         # Initialize AI service and kernel manager
         await ai_service.initialize()
@@ -75,6 +82,16 @@ async def lifespan(_app: FastAPI):
         except Exception as e:
             logger.error("Error cleaning up AI service: %s", e)
 
+        try:
+            await stop_audit_log_writer()
+        except Exception as e:
+            logger.error("Error stopping audit log writer: %s", e)
+
+        try:
+            await overview.stop_overview_tasks()
+        except Exception as e:
+            logger.error("Error stopping observability overview tasks: %s", e)
+
         try:
             await db_manager.close()
         except Exception as e:
@@ -93,6 +110,7 @@ app = FastAPI(
     docs_url=DOCS_URL,
     redoc_url=REDOC_URL,
     openapi_url=OPENAPI_URL,
+    default_response_class=DEFAULT_RESPONSE_CLASS,
     lifespan=lifespan,
 )
 
@@ -180,19 +198,19 @@ def get_version_from_pyproject():
 async def get_version():
     """Get application version and build information."""
     build_info = load_build_info()
-    return JSONResponse(content=build_info)
+    return DEFAULT_RESPONSE_CLASS(content=build_info)
 
 
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
-    return JSONResponse(content={"status": "healthy"})
+    return DEFAULT_RESPONSE_CLASS(content={"status": "healthy"})
 
 
 @app.options("/api/health")
 async def health_check_options():
     """Health check OPTIONS endpoint."""
-    return JSONResponse(content={"status": "healthy"})
+    return DEFAULT_RESPONSE_CLASS(content={"status": "healthy"})
 
 
 # Include all feature routers
@@ -0,0 +1,149 @@
+"""Embedding-based near-duplicate cache for short generated texts (e.g. chat titles)."""
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Hashable
+import logging
+import os
+
+import numpy as np
+from semantic_kernel.connectors.ai.open_ai import AzureTextEmbedding
+
+logger = logging.getLogger(__name__)
+
+
+class _ScopeIndex:
+    """Flat inner-product index over L2-normalized embeddings with LRU replacement."""
+
+    __slots__ = ("_clock", "_last_used", "_max_entries", "_values", "_vectors", "lock", "size")
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        # Held across a search running in a worker thread so add() never mutates the arrays under it
+        self.lock = asyncio.Lock()
+        self._vectors: np.ndarray | None = None
+        self._last_used = np.zeros(0, dtype=np.int64)
+        self._values: list[str] = []
+        self._clock = 0
+        self.size = 0
+
+    def search(self, vector: np.ndarray, threshold: float) -> str | None:
+        if self.size == 0:
+            return None
+        scores = self._vectors[: self.size] @ vector
+        best = int(np.argmax(scores))
+        if scores[best] < threshold:
+            return None
+        self._clock += 1
+        self._last_used[best] = self._clock
+        return self._values[best]
+
+    def add(self, vector: np.ndarray, value: str) -> None:
+        if self._vectors is None:
+            capacity = min(self._max_entries, 1024)
+            self._vectors = np.empty((capacity, vector.shape[0]), dtype=np.float32)
+            self._last_used = np.zeros(capacity, dtype=np.int64)
+
+        if self.size < self._vectors.shape[0]:
+            slot = self.size
+            self.size += 1
+            self._values.append(value)
+        elif self.size < self._max_entries:
+            # Grow geometrically so inserts stay amortized O(dim)
+            capacity = min(self._max_entries, self._vectors.shape[0] * 2)
+            self._vectors = np.resize(self._vectors, (capacity, vector.shape[0]))
+            self._last_used = np.resize(self._last_used, capacity)
+            slot = self.size
+            self.size += 1
+            self._values.append(value)
+        else:
+            # Full: overwrite the least recently used entry
+            slot = int(np.argmin(self._last_used[: self.size]))
+            self._values[slot] = value
+
+        self._clock += 1
+        self._vectors[slot] = vector
+        self._last_used[slot] = self._clock
+
+
+class SemanticCache:
+    """Scoped cache that returns a stored value for texts whose embeddings are near-identical.
+
+    Values are only returned within the scope they were stored under (e.g. one user), so stored text
+    never crosses scopes. Memory is bounded by max_scopes * max_entries_per_scope embeddings per process
+    (about 100 MB at the defaults for 1536-dimensional embeddings); the least recently used scope is
+    dropped first.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        max_entries_per_scope: int = 64,
+        max_scopes: int = 256,
+        max_chars: int = 500,
+    ):
+        self.threshold = threshold
+        self.max_entries_per_scope = max_entries_per_scope
+        self.max_scopes = max_scopes
+        self.max_chars = max_chars
+        self._embedding_service: AzureTextEmbedding | None = None
+        self._indexes: OrderedDict[Hashable, _ScopeIndex] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._embedding_service is not None
+
+    def initialize(self) -> None:
+        """Create the embedding service if an embedding deployment is configured."""
+        deployment_name = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
+        if not deployment_name:
+            logger.info("Semantic cache disabled: AZURE_OPENAI_EMBEDDING_DEPLOYMENT is not set")
+            return
+        try:
+            self._embedding_service = AzureTextEmbedding(
+                service_id="semantic_cache",
+                api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+                endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+                deployment_name=deployment_name,
+                api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
+            )
+        except Exception as e:
+            logger.warning("Semantic cache disabled: failed to create embedding service: %s", e)
+
+    def clear(self) -> None:
+        self._indexes.clear()
+
+    async def embed(self, text: str) -> np.ndarray | None:
+        """Return the normalized embedding of ``text``, or None if unavailable."""
+        if self._embedding_service is None:
+            return None
+        try:
+            embeddings = await self._embedding_service.generate_embeddings([text[: self.max_chars]])
+        except Exception as e:
+            logger.debug("Semantic cache embedding failed: %s", e)
+            return None
+        vector = np.asarray(embeddings[0], dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return vector / norm
+
+    async def lookup(self, scope: Hashable, vector: np.ndarray) -> str | None:
+        index = self._indexes.get(scope)
+        if index is None:
+            return None
+        self._indexes.move_to_end(scope)
+        # The flat scan is CPU-bound; keep it off the event loop
+        async with index.lock:
+            return await asyncio.to_thread(index.search, vector, self.threshold)
+
+    async def store(self, scope: Hashable, vector: np.ndarray, value: str) -> None:
+        index = self._indexes.get(scope)
+        if index is None:
+            index = self._indexes[scope] = _ScopeIndex(self.max_entries_per_scope)
+            while len(self._indexes) > self.max_scopes:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(scope)
+        async with index.lock:
+            index.add(vector, value)
@@ -19,6 +19,9 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Stream message attributes that may carry executed function calls
+_FUNCTION_CALL_ATTRS = ("function_calls", "tool_calls", "function_call", "function_results")
+
 
 def serialize_function_result(result: Any) -> Any:
     """Convert non-JSON serializable objects to serializable format."""
@@ -63,6 +66,7 @@ def serialize_function_result(result: Any) -> Any:
 class SemanticKernelManager:
     def __init__(self, plugin_manager=None):
         self.kernel = None
+        self.chat_completion: AzureChatCompletion | None = None
         self.plugin_manager = plugin_manager
         self._setup_kernel()
 
@@ -79,6 +83,8 @@ class SemanticKernelManager:
         )
 
         self.kernel.add_service(azure_openai_chat_service)
+        # Keep a direct handle so callers don't go through the service locator per request
+        self.chat_completion = azure_openai_chat_service
 
         # Add debug filters
         self._add_debug_filters()
@@ -198,7 +204,7 @@ class SemanticKernelManager:
                     chat_history.add_assistant_message(message["content"])
 
             # Get chat completion service
-            chat_completion = self.kernel.get_service(type=AzureChatCompletion)
+            chat_completion = self.chat_completion
 
             # Create execution settings with function calling enabled
             from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
@@ -276,7 +282,7 @@ class SemanticKernelManager:
 
                     # Also check direct attributes for function calls
                     # Only include function calls that have been executed (have results)
-                    for attr in ["function_calls", "tool_calls", "function_call", "function_results"]:
+                    for attr in _FUNCTION_CALL_ATTRS:
                         if hasattr(stream_message, attr):
                             attr_value = getattr(stream_message, attr)
                             if attr_value:
@@ -3,7 +3,7 @@ import os
 import time
 
 from dotenv import load_dotenv
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 import jwt
 import requests
@@ -24,6 +24,9 @@ AZURE_API_CLIENT_ID = os.getenv("AZURE_API_CLIENT_ID")  # API app
 # JWT Bearer token extractor
 security = HTTPBearer()
 
+# Upper bound on verified tokens kept in memory between requests
+_VERIFIED_TOKEN_CACHE_SIZE = 1024
+
 
 class EntraIDAuth:
     def __init__(self):
@@ -39,6 +42,8 @@ class EntraIDAuth:
         self._jwks_cache = None
         self._jwks_cache_time = 0
         self._cache_duration = 3600  # 1 hour in seconds
+        # Verified payloads keyed by raw token, so repeat requests skip signature validation
+        self._verified_tokens: dict[str, tuple[float, dict]] = {}
 
         # Validate required configuration
         if not all([self.tenant_id, self.client_id, self.api_client_id]):
@@ -78,10 +83,44 @@ class EntraIDAuth:
 
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unable to find signing key")
 
+    def _get_verified_payload(self, token: str) -> dict | None:
+        """Return the cached payload for a previously verified token that has not expired"""
+        cached = self._verified_tokens.get(token)
+        if cached is None:
+            return None
+        expires_at, payload = cached
+        if time.time() >= expires_at:
+            del self._verified_tokens[token]
+            return None
+        return payload
+
+    def _cache_verified_payload(self, token: str, payload: dict) -> None:
+        """Remember a verified payload until the token expires (at most one JWKS cache period)"""
+        current_time = time.time()
+        expires_at = current_time + self._cache_duration
+        exp = payload.get("exp")
+        if isinstance(exp, int | float):
+            expires_at = min(expires_at, exp)
+        if expires_at <= current_time:
+            return
+
+        if len(self._verified_tokens) >= _VERIFIED_TOKEN_CACHE_SIZE:
+            self._verified_tokens = {
+                key: value for key, value in self._verified_tokens.items() if value[0] > current_time
+            }
+            if len(self._verified_tokens) >= _VERIFIED_TOKEN_CACHE_SIZE:
+                # Drop the oldest entry (dicts keep insertion order)
+                del self._verified_tokens[next(iter(self._verified_tokens))]
+        self._verified_tokens[token] = (expires_at, payload)
+
     async def verify_token(self, credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
         """Verify and decode the JWT token with proper iss/aud/azp validation"""
         token = credentials.credentials
 
+        cached_payload = self._get_verified_payload(token)
+        if cached_payload is not None:
+            return cached_payload
+
         try:
             # Decode token header to get key information
             unverified_header = jwt.get_unverified_header(token)
@@ -126,6 +165,7 @@ class EntraIDAuth:
                     headers={"WWW-Authenticate": "Bearer"},
                 )
 
+            self._cache_verified_payload(token, payload)
             return payload
         except jwt.exceptions.InvalidAudienceError as e:
             logger.error(
@@ -171,7 +211,9 @@ entra_auth = EntraIDAuth()
 
 # Dependency for protecting routes with JIT provisioning
 async def get_current_user(
-    token_payload: dict = Depends(entra_auth.verify_token), db_session=Depends(get_db_session)
+    token_payload: dict = Depends(entra_auth.verify_token),
+    db_session=Depends(get_db_session),
+    request: Request = None,
 ) -> UserV4:
     """
     Get current user information from token payload with JIT provisioning.
@@ -181,21 +223,31 @@ async def get_current_user(
     2. Extracts user claims from the token
     3. Creates/updates tenant and user in the database
     4. Returns the database user object
+
+    The resolved user is stashed on ``request.state.current_user`` so it is provisioned
+    at most once per request, however many dependencies or middlewares ask for it.
     """
+    if request is not None:
+        current_user = getattr(request.state, "current_user", None)
+        if current_user is not None:
+            return current_user
+
     try:
         # Initialize user manager
         user_manager = UserManager(db_session)
 
         # Perform JIT provisioning
         user = await user_manager.upsert_user_from_token(token_payload)
-
-        return user
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"User provisioning failed: {e!s}",
         ) from e
 
+    if request is not None:
+        request.state.current_user = user
+    return user
+
 
 # Legacy dependency for backward compatibility (returns dict instead of UserV4)
 async def get_current_user_dict(token_payload: dict = Depends(entra_auth.verify_token)) -> dict:
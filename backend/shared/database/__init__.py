@@ -1,3 +1,3 @@
-from .database import Base, DatabaseConfig, db_manager, get_db_session
+from .database import Base, DatabaseConfig, db_manager, get_db_session, get_stream_db_session, start_stream
 
-__all__ = ["Base", "DatabaseConfig", "db_manager", "get_db_session"]
+__all__ = ["Base", "DatabaseConfig", "db_manager", "get_db_session", "get_stream_db_session", "start_stream"]
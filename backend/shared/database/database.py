@@ -1,9 +1,11 @@
-from collections.abc import AsyncGenerator
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator, Sequence
 from contextlib import asynccontextmanager
 import logging
 import os
 
 from dotenv import load_dotenv
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -28,6 +30,14 @@ class DatabaseConfig:
         # Windows-specific SSL configuration
         self.ssl_mode = os.getenv("DB_SSL_MODE", "prefer")
 
+        # Connection pool sizing (per worker process)
+        self.pool_size = int(os.getenv("DB_POOL_SIZE", "10"))
+        self.max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+        self.pool_timeout = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+        self.pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        # Connections opened at startup so the first requests don't pay for connection setup
+        self.pool_warmup = min(int(os.getenv("DB_POOL_WARMUP", str(self.pool_size))), self.pool_size)
+
     @property
     def database_url(self) -> str:
         """Generate database URL for SQLAlchemy."""
@@ -63,10 +73,11 @@ class DatabaseManager:
         self.engine = create_async_engine(
             self.config.database_url,
             echo=False,  # Set to True for SQL query logging in development
-            pool_size=10,
-            max_overflow=20,
+            pool_size=self.config.pool_size,
+            max_overflow=self.config.max_overflow,
+            pool_timeout=self.config.pool_timeout,  # Fail fast instead of queueing for the default 30s
             pool_pre_ping=True,  # Validate connections before use
-            pool_recycle=3600,  # Recycle connections every hour
+            pool_recycle=self.config.pool_recycle,  # Recycle before typical proxy/firewall idle timeouts
         )
         self.async_session_maker = async_sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -84,12 +95,29 @@ class DatabaseManager:
 
                 await conn.execute(text("SELECT 1"))
 
+            await self._warm_pool()
+
             logger.info("Database connection initialized successfully")
 
         except Exception as e:
             logger.error("Failed to initialize database connection: %s", e)
             raise
 
+    async def _warm_pool(self):
+        """Open up to pool_warmup connections at once and return them to the pool."""
+        if self.config.pool_warmup <= 0:
+            return
+
+        connections = [self.engine.connect() for _ in range(self.config.pool_warmup)]
+        try:
+            await asyncio.gather(*(conn.start() for conn in connections))
+        except Exception as e:
+            # The connection test above succeeded; a partial warm-up only costs latency later
+            logger.warning("Database pool warm-up incomplete: %s", e)
+        finally:
+            # Connections that never started raise on close; ignore them
+            await asyncio.gather(*(conn.close() for conn in connections), return_exceptions=True)
+
     async def close(self):
         """Close database connection."""
         if self.engine:
@@ -122,6 +150,41 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+# Dependency for endpoints that stream their response body
+async def get_stream_db_session() -> AsyncSession:
+    """Dependency that provides a database session owned by a streaming response.
+
+    Yield dependencies are torn down before a StreamingResponse body is sent, so this session is not
+    closed by FastAPI: the endpoint closes it, either when starting the stream fails or at the end of
+    its body generator. A session that is never used holds no connection.
+    """
+    if not db_manager.async_session_maker:
+        db_manager.setup()
+    return db_manager.async_session_maker()
+
+
+async def start_stream(
+    session: AsyncSession, statement, params=None, *, batch_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    """Execute ``statement`` and fetch its first batch of rows; return an iterator over all batches.
+
+    Call this before building the StreamingResponse: a failing query then still raises (and can be
+    answered with an error status) instead of truncating a body that has already started.
+    """
+    result = await session.stream(statement, params, execution_options={"yield_per": batch_size})
+    partitions = result.partitions()
+    first_batch = await anext(partitions, None)
+
+    async def batches():
+        if first_batch is None:
+            return
+        yield first_batch
+        async for rows in partitions:
+            yield rows
+
+    return batches()
+
+
 @asynccontextmanager
 async def lifespan_handler():
     """Context manager for application lifespan."""
@@ -0,0 +1,23 @@
+"""Annotated dependency aliases shared by feature routers.
+
+Using one ``Depends`` instance per dependency lets every route share the same dependant
+definition, and keeps signatures short.
+"""
+
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.auth import get_current_user
+from shared.database import get_db_session, get_stream_db_session
+from shared.models import UserV4
+from shared.utils import get_user_dependency
+
+CurrentUser = Annotated[UserV4, Depends(get_current_user)]
+CurrentUserDict = Annotated[dict, Depends(get_user_dependency())]
+DBSession = Annotated[AsyncSession, Depends(get_db_session)]
+# For StreamingResponse endpoints; the endpoint closes this session itself (see get_stream_db_session)
+StreamDBSession = Annotated[AsyncSession, Depends(get_stream_db_session)]
+
+__all__ = ["CurrentUser", "CurrentUserDict", "DBSession", "StreamDBSession"]
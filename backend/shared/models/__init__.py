@@ -5,6 +5,7 @@ from .models import (
     ChatSessionV4,
     DomainV4,
     EnvironmentV4,
+    ObservabilityRollupV4,
     OrganizationV4,
     OtelLogsV4,
     OtelMetricsV4,
@@ -21,6 +22,7 @@ __all__ = [
     "ChatSessionV4",
     "DomainV4",
     "EnvironmentV4",
+    "ObservabilityRollupV4",
     "OrganizationV4",
     "OtelLogsV4",
     "OtelMetricsV4",
@@ -19,6 +19,9 @@ from sqlalchemy.sql import func
 
 from shared.database import Base
 
+# Trigram indexes below need pg_trgm; make create_all work on a fresh database
+sa.event.listen(Base.metadata, "before_create", sa.DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
 
 class AuditLogV4(Base):
     """Audit log model for tracking user actions."""
@@ -39,6 +42,19 @@ class AuditLogV4(Base):
         return f"<AuditLogV4(id={self.id}, action='{self.action}', user_id={self.user_id})>"
 
 
+class ObservabilityRollupV4(Base):
+    """Rolling-window observability counters, refreshed in the background for the overview."""
+
+    __tablename__ = "observability_rollup_v4"
+
+    key = Column(Text, primary_key=True)
+    value = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ObservabilityRollupV4(key='{self.key}', value={self.value})>"
+
+
 class OrganizationV4(Base):
     """Organization master table."""
 
@@ -48,7 +64,7 @@ class OrganizationV4(Base):
     code = Column(String(255), unique=True, nullable=False, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    is_active = Column(Boolean, default=True, nullable=False, index=True)
+    is_active = Column(Boolean, default=True, nullable=False)
     created_by = Column(String(255), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_by = Column(String(255), nullable=True)
@@ -67,7 +83,7 @@ class DomainV4(Base):
     code = Column(String(255), unique=True, nullable=False, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    is_active = Column(Boolean, default=True, nullable=False, index=True)
+    is_active = Column(Boolean, default=True, nullable=False)
     created_by = Column(String(255), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_by = Column(String(255), nullable=True)
@@ -86,7 +102,7 @@ class EnvironmentV4(Base):
     code = Column(String(255), unique=True, nullable=False, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    is_active = Column(Boolean, default=True, nullable=False, index=True)
+    is_active = Column(Boolean, default=True, nullable=False)
     created_by = Column(String(255), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_by = Column(String(255), nullable=True)
@@ -105,7 +121,7 @@ class AudienceV4(Base):
     code = Column(String(255), unique=True, nullable=False, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    is_active = Column(Boolean, default=True, nullable=False, index=True)
+    is_active = Column(Boolean, default=True, nullable=False)
     created_by = Column(String(255), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_by = Column(String(255), nullable=True)
@@ -169,6 +185,18 @@ class SettingsV4(Base):
     environment = relationship("EnvironmentV4", backref="settings")
     audience = relationship("AudienceV4", backref="settings")
 
+    __table_args__ = (
+        sa.Index("ix_settings_v4_key_scope_key", key, scope_key),
+        # Settings resolution: best match per key among active, non-secret rows
+        sa.Index(
+            "ix_settings_v4_resolve",
+            key,
+            specificity.desc().nulls_last(),
+            updated_at.desc(),
+            postgresql_where=sa.text("is_active AND NOT is_secret"),
+        ),
+    )
+
     def __repr__(self):
         scope_parts = []
         if self.organization_id:
@@ -194,6 +222,14 @@ class TenantV4(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        sa.Index(
+            "ix_tenants_v4_tenant_id_trgm",
+            sa.text("(CAST(tenant_id AS VARCHAR)) gin_trgm_ops"),
+            postgresql_using="gin",
+        ),
+    )
+
     def __repr__(self):
         return f"<TenantV4(id={self.id}, tenant_id={self.tenant_id})>"
 
@@ -231,7 +267,23 @@ class UserV4(Base):
     environment = relationship("EnvironmentV4", backref="users")
 
     # Unique constraint on tenant_id + oid
-    __table_args__ = (sa.UniqueConstraint("tenant_id", "oid", name="uq_users_v4_tenant_oid"),)
+    __table_args__ = (
+        sa.UniqueConstraint("tenant_id", "oid", name="uq_users_v4_tenant_oid"),
+        # Trigram indexes backing the admin ILIKE '%term%' search
+        sa.Index(
+            "ix_users_v4_display_name_trgm",
+            display_name,
+            postgresql_using="gin",
+            postgresql_ops={"display_name": "gin_trgm_ops"},
+        ),
+        sa.Index("ix_users_v4_upn_trgm", upn, postgresql_using="gin", postgresql_ops={"upn": "gin_trgm_ops"}),
+        sa.Index("ix_users_v4_email_trgm", email, postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+        sa.Index(
+            "ix_users_v4_oid_trgm",
+            sa.text("(CAST(oid AS VARCHAR)) gin_trgm_ops"),
+            postgresql_using="gin",
+        ),
+    )
 
     def __repr__(self):
         return f"<UserV4(id={self.id}, oid={self.oid}, upn='{self.upn}', email='{self.email}')>"
@@ -250,7 +302,12 @@ class ChatSessionV4(Base):
 
     # Relationships
     user = relationship("UserV4", backref="chat_sessions")
-    messages = relationship("ChatMessageV4", back_populates="session", cascade="all, delete-orphan")
+    # The session_id foreign key cascades deletes in the database, so the ORM need not load messages first
+    messages = relationship(
+        "ChatMessageV4", back_populates="session", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    __table_args__ = (sa.Index("ix_chat_sessions_v4_user_id_updated_at", user_id, updated_at.desc()),)
 
     def __repr__(self):
         return f"<ChatSessionV4(id={self.id}, user_id={self.user_id}, title='{self.title}')>"
@@ -274,31 +331,44 @@ class ChatMessageV4(Base):
     user = relationship("UserV4", backref="chat_messages")
 
     # Check constraint for role
-    __table_args__ = (sa.CheckConstraint("role IN ('user', 'assistant', 'system')", name="ck_chat_messages_v4_role"),)
+    __table_args__ = (
+        sa.CheckConstraint("role IN ('user', 'assistant', 'system')", name="ck_chat_messages_v4_role"),
+        sa.Index("ix_chat_messages_v4_session_id_created_at", session_id, created_at),
+    )
 
     def __repr__(self):
         return f"<ChatMessageV4(id={self.id}, session_id={self.session_id}, role='{self.role}')>"
 
 
 class OtelMetricsV4(Base):
-    """OpenTelemetry Metric model."""
+    """OpenTelemetry Metric model (range-partitioned by ts, see migrations)."""
 
     __tablename__ = "otel_metrics_v4"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     metric_name = Column(Text, nullable=False)
-    ts = Column(DateTime(timezone=True), nullable=False)
+    ts = Column(DateTime(timezone=True), primary_key=True, nullable=False)  # Partition key
     resource_attrs = Column(JSONB, nullable=True)
     scope_attrs = Column(JSONB, nullable=True)
     data = Column(JSONB, nullable=True)
     ingested_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        sa.Index("ix_otel_metrics_v4_ts_metric_name", ts, metric_name),
+        sa.Index(
+            "ix_otel_metrics_v4_metric_name_trgm",
+            metric_name,
+            postgresql_using="gin",
+            postgresql_ops={"metric_name": "gin_trgm_ops"},
+        ),
+    )
+
     def __repr__(self):
         return f"<OtelMetricsV4(id={self.id}, metric_name='{self.metric_name}')>"
 
 
 class OtelSpansV4(Base):
-    """OpenTelemetry Span model."""
+    """OpenTelemetry Span model (range-partitioned by start_time, see migrations)."""
 
     __tablename__ = "otel_spans_v4"
 
@@ -308,7 +378,7 @@ class OtelSpansV4(Base):
     parent_id = Column(Text, nullable=True)  # Changed to nullable
     name = Column(Text, nullable=False)
     kind = Column(Text, nullable=True)
-    start_time = Column(DateTime(timezone=True), nullable=False)
+    start_time = Column(DateTime(timezone=True), primary_key=True, nullable=False)  # Partition key
     end_time = Column(DateTime(timezone=True), nullable=False)
 
     # Add computed column for duration in milliseconds
@@ -318,10 +388,6 @@ class OtelSpansV4(Base):
     service_name = Column(Text, nullable=True)
     service_version = Column(Text, nullable=True)
 
-    # Add GenAI computed columns
-    operation_name = Column(Text, Computed("(attributes->>'gen_ai.operation.name')"), nullable=True)
-    model_name = Column(Text, Computed("(attributes->>'gen_ai.request.model')"), nullable=True)
-
     resource_attr = Column(JSONB, nullable=True)
     attributes = Column(JSONB, nullable=True)
     events = Column(JSONB, nullable=True)
@@ -329,12 +395,27 @@ class OtelSpansV4(Base):
     raw = Column(JSONB, nullable=False)
     ingested_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        sa.Index("ix_otel_spans_v4_start_time_trace_id", start_time, trace_id),
+        sa.Index("ix_otel_spans_v4_start_time_brin", start_time, postgresql_using="brin"),
+        sa.Index("ix_otel_spans_v4_duration_ms", duration_ms),
+        sa.Index(
+            "ix_otel_spans_v4_trace_id_trgm",
+            trace_id,
+            postgresql_using="gin",
+            postgresql_ops={"trace_id": "gin_trgm_ops"},
+        ),
+        # GenAI attributes are filtered through expression indexes rather than generated columns
+        sa.Index("ix_otel_spans_v4_operation_name", sa.text("(attributes->>'gen_ai.operation.name')")),
+        sa.Index("ix_otel_spans_v4_model_name", sa.text("(attributes->>'gen_ai.request.model')")),
+    )
+
     def __repr__(self):
         return f"<OtelSpansV4(id={self.id}, name='{self.name}')>"
 
 
 class OtelLogsV4(Base):
-    """OpenTelemetry Log model."""
+    """OpenTelemetry Log model (range-partitioned by time, see migrations)."""
 
     __tablename__ = "otel_logs_v4"
 
@@ -343,7 +424,7 @@ class OtelLogsV4(Base):
     trace_id = Column(Text, nullable=True)
     span_id = Column(Text, nullable=True)
     trace_flags = Column(SmallInteger, nullable=True)
-    time = Column(DateTime(timezone=True), nullable=False)
+    time = Column(DateTime(timezone=True), primary_key=True, nullable=False)  # Partition key
     observed_time = Column(DateTime(timezone=True), nullable=True)
     severity_number = Column(SmallInteger, nullable=True)
     severity_text = Column(Text, nullable=True)
@@ -352,13 +433,17 @@ class OtelLogsV4(Base):
     attributes = Column(JSONB, nullable=False, default={})  # Changed to NOT NULL with default
     resource = Column(JSONB, nullable=False, default={})  # Changed to NOT NULL with default
     dropped_attributes = Column(Integer, nullable=True)
-
-    # Add computed columns
-    service_name = Column(Text, Computed("(resource->'attributes'->>'service.name')"), nullable=True)
-    code_function_name = Column(Text, Computed("(attributes->>'code.function.name')"), nullable=True)
-
     raw = Column(JSONB, nullable=False)
     ingested_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        sa.Index("ix_otel_logs_v4_time_trace_id", time, trace_id),
+        sa.Index("ix_otel_logs_v4_time_brin", time, postgresql_using="brin"),
+        # Recent-errors window on the observability overview (severity_number >= 17 is ERROR level)
+        sa.Index("ix_otel_logs_v4_errors_time", time, postgresql_where=sa.text("severity_number >= 17")),
+        sa.Index("ix_otel_logs_v4_service_name", sa.text("(resource->'attributes'->>'service.name')")),
+        sa.Index("ix_otel_logs_v4_code_function_name", sa.text("(attributes->>'code.function.name')")),
+    )
+
     def __repr__(self):
         return f"<OtelLogsV4(id={self.id}, event_name='{self.event_name}')>"
@@ -1,3 +1,27 @@
-from .common import create_audit_log, extract_user_info, get_demo_user, get_user_dependency
+from .common import (
+    count_rows,
+    create_audit_log,
+    extract_user_id,
+    extract_user_info,
+    get_demo_user,
+    get_user_dependency,
+    iso_timestamp,
+    stage_audit_log,
+    start_audit_log_writer,
+    stop_audit_log_writer,
+)
+from .ttl_cache import TTLCache
 
-__all__ = ["create_audit_log", "extract_user_info", "get_demo_user", "get_user_dependency"]
+__all__ = [
+    "TTLCache",
+    "count_rows",
+    "create_audit_log",
+    "extract_user_id",
+    "extract_user_info",
+    "get_demo_user",
+    "get_user_dependency",
+    "iso_timestamp",
+    "stage_audit_log",
+    "start_audit_log_writer",
+    "stop_audit_log_writer",
+]
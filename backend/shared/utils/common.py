@@ -1,14 +1,30 @@
+import asyncio
+from contextlib import suppress
+import functools
 import logging
 import os
 
 from fastapi import Request
+from sqlalchemy import event, func, insert, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from shared.auth import get_current_user_dict
+from shared.database import db_manager
 from shared.models import AuditLogV4, UserV4
 
 logger = logging.getLogger(__name__)
 
+# Background audit log writer; when running, audit rows are queued and inserted in batches
+_AUDIT_BATCH_SIZE = 64
+# How long the writer waits for more rows after the first one before flushing a partial batch
+_AUDIT_FLUSH_INTERVAL = 0.05
+_audit_queue: asyncio.Queue | None = None
+_audit_writer_task: asyncio.Task | None = None
+
+# Below this many estimated rows an exact COUNT(*) is cheap enough and avoids stale planner statistics
+_ESTIMATED_COUNT_THRESHOLD = 10_000
+
 # App mode configuration
 APP_MODE = os.getenv("APP_MODE", "development").lower()
 IS_AUTH_DISABLED = APP_MODE == "demo"
@@ -59,19 +75,178 @@ def extract_user_info(current_user: dict | UserV4) -> tuple[str, str]:
     raise ValueError(f"Unsupported current_user type: {type(current_user)}")
 
 
+def extract_user_id(current_user) -> str | None:
+    """Return the id recorded in created_by/updated_by/audit columns for a user dict or UserV4 instance."""
+    if isinstance(current_user, dict):
+        return current_user.get("user_id")
+    return str(getattr(current_user, "oid", None))
+
+
+def _demo_user_dependency():
+    return get_demo_user()
+
+
+@functools.lru_cache(maxsize=1)
 def get_user_dependency():
-    """Return appropriate user dependency based on app mode"""
+    """Return appropriate user dependency based on app mode.
+
+    Memoized so every router receives the same callable, which keeps FastAPI's
+    per-request dependency cache key stable and resolves the user only once.
+    """
     if IS_AUTH_DISABLED:
         # Return a function that always returns demo user
-        def demo_user_dependency():
-            return get_demo_user()
-
-        return demo_user_dependency
+        return _demo_user_dependency
     else:
         # Return the dict-compatible authentication dependency
         return get_current_user_dict
 
 
+async def count_rows(db: AsyncSession, model) -> int:
+    """Count all rows of ``model``'s table, using the planner's estimate for large tables.
+
+    The estimate (pg_class.reltuples) is only as fresh as the last ANALYZE/autovacuum, so the result
+    is approximate once the table is past the threshold; small or never-analyzed tables are counted exactly.
+    """
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": model.__tablename__},
+    )
+    estimate = result.scalar()
+    if estimate is not None and estimate >= _ESTIMATED_COUNT_THRESHOLD:
+        return estimate
+
+    result = await db.execute(select(func.count()).select_from(model))
+    return result.scalar()
+
+
+def iso_timestamp(column):
+    """SQL expression rendering a timestamptz column as an ISO 8601 UTC string (NULL stays NULL).
+
+    Lets list endpoints skip building a datetime and calling isoformat() per row in Python.
+    """
+    return func.to_char(func.timezone("UTC", column), 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"')
+
+
+async def _write_audit_logs():
+    """Insert queued audit log rows, coalescing up to a batch (or one flush interval) into one INSERT."""
+    loop = asyncio.get_running_loop()
+    while True:
+        rows = [await _audit_queue.get()]
+        deadline = loop.time() + _AUDIT_FLUSH_INTERVAL
+        while len(rows) < _AUDIT_BATCH_SIZE:
+            if _audit_queue.empty():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    rows.append(await asyncio.wait_for(_audit_queue.get(), timeout=remaining))
+                except TimeoutError:
+                    break
+            else:
+                rows.append(_audit_queue.get_nowait())
+
+        try:
+            async with db_manager.async_session_maker() as db:
+                await db.execute(insert(AuditLogV4), rows)
+                await db.commit()
+        except Exception as e:
+            logger.error("Failed to write %d audit log(s): %s", len(rows), e)
+        finally:
+            for _ in rows:
+                _audit_queue.task_done()
+
+
+def start_audit_log_writer():
+    """Start writing audit logs in the background instead of on the request path."""
+    global _audit_queue, _audit_writer_task
+    if _audit_writer_task is not None:
+        return
+    _audit_queue = asyncio.Queue(maxsize=10_000)
+    _audit_writer_task = asyncio.create_task(_write_audit_logs())
+
+
+async def stop_audit_log_writer(timeout: float = 5.0):
+    """Flush pending audit logs and stop the background writer."""
+    global _audit_queue, _audit_writer_task
+    if _audit_writer_task is None:
+        return
+    with suppress(TimeoutError):
+        await asyncio.wait_for(_audit_queue.join(), timeout=timeout)
+    _audit_writer_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await _audit_writer_task
+    _audit_queue = None
+    _audit_writer_task = None
+
+
+def _audit_log_row(
+    request: Request,
+    current_user: dict | UserV4,
+    action: str,
+    resource: str,
+    resource_id: str,
+    details: str,
+) -> dict:
+    return {
+        "user_id": extract_user_id(current_user),
+        "action": action,
+        "resource": resource,
+        "resource_id": resource_id,
+        "details": details,
+        "ip_address": request.client.host if request.client else None,
+        "user_agent": request.headers.get("user-agent"),
+    }
+
+
+def _write_audit_log_now(row: dict) -> None:
+    """Insert one audit row on its own connection, from synchronous code running under the async engine.
+
+    Session event hooks such as after_commit run inside SQLAlchemy's greenlet bridge, where the sync
+    facade of the async engine can still drive the asyncpg connection.
+    """
+    with Session(db_manager.engine.sync_engine) as session:
+        session.execute(insert(AuditLogV4), [row])
+        session.commit()
+
+
+def _enqueue_audit_log(row: dict) -> None:
+    # Runs inside the commit; if the writer stopped or filled up since staging, write the row directly
+    # so the audit trail of a committed change is never dropped
+    if _audit_queue is not None:
+        with suppress(asyncio.QueueFull):
+            _audit_queue.put_nowait(row)
+            return
+    logger.warning("Audit log queue unavailable, writing audit log for %s %s inline", row["action"], row["resource"])
+    try:
+        _write_audit_log_now(row)
+    except Exception as e:
+        logger.error("Failed to write audit log for %s %s: %s", row["action"], row["resource"], e)
+
+
+def stage_audit_log(
+    db: AsyncSession,
+    request: Request,
+    current_user: dict | UserV4,
+    action: str,
+    resource: str,
+    resource_id: str,
+    details: str,
+):
+    """Record an audit log entry as part of the caller's pending transaction; the caller commits.
+
+    Without the background writer the row is added to the session and inserted in the same commit as
+    the change it describes. With the writer running it is queued only once that commit succeeds, or
+    written right away on its own connection if the queue has since filled up or stopped.
+    """
+    row = _audit_log_row(request, current_user, action, resource, resource_id, details)
+
+    if _audit_queue is not None and not _audit_queue.full():
+        event.listen(db.sync_session, "after_commit", lambda _session: _enqueue_audit_log(row), once=True)
+        return
+
+    db.add(AuditLogV4(**row))
+
+
 async def create_audit_log(
     db: AsyncSession,
     request: Request,
@@ -81,27 +256,22 @@ async def create_audit_log(
     resource_id: str,
     details: str,
 ):
-    """Create audit log entry."""
+    """Create audit log entry.
+
+    When the background writer is running the entry is queued and written after the response;
+    otherwise (or if the queue is full) it is written inline with the given session.
+    """
     try:
-        client_ip = request.client.host if request.client else None
-        user_agent = request.headers.get("user-agent")
-
-        # current user can be a dict or a UserV4 class instance. Handle both cases carefully
-        user_id = (
-            current_user.get("user_id") if isinstance(current_user, dict) else str(getattr(current_user, "oid", None))
-        )
-
-        audit_log = AuditLogV4(
-            user_id=user_id,
-            action=action,
-            resource=resource,
-            resource_id=resource_id,
-            details=details,
-            ip_address=client_ip,
-            user_agent=user_agent,
-        )
-
-        db.add(audit_log)
+        row = _audit_log_row(request, current_user, action, resource, resource_id, details)
+
+        if _audit_queue is not None:
+            try:
+                _audit_queue.put_nowait(row)
+                return
+            except asyncio.QueueFull:
+                logger.warning("Audit log queue is full, writing audit log inline")
+
+        db.add(AuditLogV4(**row))
         await db.commit()
     except Exception as e:
         logger.error("Failed to create audit log: %s", e)
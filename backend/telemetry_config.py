@@ -20,6 +20,7 @@ from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter
 from opentelemetry.semconv.resource import ResourceAttributes
 from opentelemetry.trace import set_tracer_provider
+from sqlalchemy import text
 
 from shared.database import db_manager
 from shared.models import OtelLogsV4, OtelMetricsV4, OtelSpansV4
@@ -32,6 +33,10 @@ _logs_queue: asyncio.Queue = None
 _metrics_queue: asyncio.Queue = None
 _background_tasks: set = set()
 
+# Range-partitioned telemetry tables and how often their upcoming partitions are checked
+_PARTITIONED_TABLES = ("otel_spans_v4", "otel_logs_v4", "otel_metrics_v4")
+_PARTITION_MAINTENANCE_INTERVAL = 24 * 60 * 60
+
 
 def get_project_info_from_pyproject():
     """
@@ -103,6 +108,31 @@ async def _process_metrics_queue():
             logger.error("Error processing metrics queue: %s", e)
 
 
+async def ensure_telemetry_partitions(months_ahead: int = 3):
+    """Create monthly partitions for the telemetry tables up to months_ahead months from now."""
+    if not db_manager.async_session_maker:
+        logger.warning("Database session maker not initialized, skipping telemetry partition maintenance")
+        return
+
+    try:
+        async with db_manager.async_session_maker() as db:
+            for table in _PARTITIONED_TABLES:
+                await db.execute(
+                    text("SELECT create_monthly_partitions(:table, :months_ahead)"),
+                    {"table": table, "months_ahead": months_ahead},
+                )
+            await db.commit()
+    except Exception as e:
+        logger.error("Error creating telemetry partitions: %s", e)
+
+
+async def _maintain_partitions():
+    """Periodically make sure upcoming telemetry partitions exist."""
+    while True:
+        await asyncio.sleep(_PARTITION_MAINTENANCE_INTERVAL)
+        await ensure_telemetry_partitions()
+
+
 async def _save_spans_to_db(spans: typing.Sequence[ReadableSpan]):
     """Save spans data to PostgreSQL using shared session manager."""
     if not db_manager.async_session_maker:
@@ -421,9 +451,10 @@ def setup_telemetry(service_name: str | None = None, service_version: str | None
     spans_task = asyncio.create_task(_process_spans_queue())
     logs_task = asyncio.create_task(_process_logs_queue())
     metrics_task = asyncio.create_task(_process_metrics_queue())
+    partitions_task = asyncio.create_task(_maintain_partitions())
 
     # Keep references to tasks to prevent garbage collection
-    _background_tasks.update({spans_task, logs_task, metrics_task})
+    _background_tasks.update({spans_task, logs_task, metrics_task, partitions_task})
 
     # Create resource
     resource = Resource.create(
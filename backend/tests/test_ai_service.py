@@ -0,0 +1,70 @@
+"""
+Tests for the AI service rate-limit retry.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from ai_service import _RATE_LIMIT_ATTEMPTS, _retry_on_rate_limit
+
+
+class RateLimitError(Exception):
+    """Stand-in for an HTTP 429 error raised by the OpenAI client."""
+
+    status_code = 429
+
+
+class TestRetryOnRateLimit:
+    """Test _retry_on_rate_limit backoff behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self):
+        """Test a completion rate limited twice succeeds on the third attempt."""
+        completion = AsyncMock(side_effect=[RateLimitError(), RateLimitError(), "done"])
+
+        with patch("ai_service.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            result = await _retry_on_rate_limit(completion)
+
+        assert result == "done"
+        assert completion.await_count == 3
+        assert mock_sleep.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        """Test the rate-limit error is raised once all attempts are used."""
+        completion = AsyncMock(side_effect=RateLimitError())
+
+        with patch("ai_service.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            with pytest.raises(RateLimitError):
+                await _retry_on_rate_limit(completion)
+
+        assert completion.await_count == _RATE_LIMIT_ATTEMPTS == 3
+        assert mock_sleep.await_count == _RATE_LIMIT_ATTEMPTS - 1
+
+    @pytest.mark.asyncio
+    async def test_retries_wrapped_rate_limit(self):
+        """Test a rate-limit error wrapped in another exception is still retried."""
+
+        async def completion():
+            if completion.calls == 0:
+                completion.calls += 1
+                raise RuntimeError("completion failed") from RateLimitError()
+            return "done"
+
+        completion.calls = 0
+
+        with patch("ai_service.asyncio.sleep", new_callable=AsyncMock):
+            assert await _retry_on_rate_limit(completion) == "done"
+
+    @pytest.mark.asyncio
+    async def test_other_errors_not_retried(self):
+        """Test errors other than rate limiting are raised immediately."""
+        completion = AsyncMock(side_effect=ValueError("bad request"))
+
+        with patch("ai_service.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            with pytest.raises(ValueError):
+                await _retry_on_rate_limit(completion)
+
+        assert completion.await_count == 1
+        mock_sleep.assert_not_awaited()
@@ -13,6 +13,7 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared.auth import EntraIDAuth, entra_auth, get_current_user, get_current_user_dict
+from shared.auth.auth import _VERIFIED_TOKEN_CACHE_SIZE
 from shared.models import UserV4
 
 
@@ -239,6 +240,57 @@ class TestEntraIDAuth:
             assert "Authentication error" in str(exc_info.value.detail)
             assert exc_info.value.headers == {"WWW-Authenticate": "Bearer"}
 
+    @pytest.mark.asyncio
+    async def test_verify_token_expired_not_served_from_cache(self, monkeypatch):
+        """Test a cached token is verified again once it has expired."""
+        monkeypatch.setattr("shared.auth.auth.AZURE_TENANT_ID", "test-tenant-id")
+        monkeypatch.setattr("shared.auth.auth.AZURE_CLIENT_ID", "test-client-id")
+        monkeypatch.setattr("shared.auth.auth.AZURE_API_CLIENT_ID", "test-api-client-id")
+
+        now = time.time()
+        mock_payload = {
+            "oid": "user-id-123",
+            "iss": "https://login.microsoftonline.com/test-tenant-id/v2.0",
+            "aud": "test-api-client-id",
+            "azp": "test-client-id",
+            "exp": now + 60,
+        }
+
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="expiring-token")
+
+        auth = EntraIDAuth()
+
+        with patch("jwt.get_unverified_header") as mock_header, \
+             patch.object(auth, "_get_signing_key") as mock_key, \
+             patch("jwt.decode") as mock_decode, \
+             patch("shared.auth.auth.time.time") as mock_time:
+
+            mock_header.return_value = {"kid": "test-key", "alg": "RS256"}
+            mock_key.return_value = Mock()
+            mock_decode.return_value = mock_payload
+            mock_time.return_value = now
+
+            assert await auth.verify_token(credentials) == mock_payload
+            # Served from the verified-token cache while the token is still valid
+            assert await auth.verify_token(credentials) == mock_payload
+            assert mock_decode.call_count == 2
+
+            mock_time.return_value = now + 61
+            assert await auth.verify_token(credentials) == mock_payload
+            assert mock_decode.call_count == 4
+
+    def test_verified_token_cache_is_bounded(self):
+        """Test the verified-token cache evicts the oldest entry once full."""
+        auth = EntraIDAuth()
+        payload = {"oid": "user-id-123", "exp": time.time() + 600}
+
+        for i in range(_VERIFIED_TOKEN_CACHE_SIZE + 1):
+            auth._cache_verified_payload(f"token-{i}", payload)
+
+        assert len(auth._verified_tokens) == _VERIFIED_TOKEN_CACHE_SIZE
+        assert "token-0" not in auth._verified_tokens
+        assert f"token-{_VERIFIED_TOKEN_CACHE_SIZE}" in auth._verified_tokens
+
 
 class TestGetCurrentUserDict:
     """Test get_current_user_dict function (legacy compatibility)."""
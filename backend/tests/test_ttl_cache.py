@@ -0,0 +1,85 @@
+"""
+Tests for the TTL cache utility.
+"""
+
+import pytest
+
+from shared.utils import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the cache module."""
+    now = [1000.0]
+    monkeypatch.setattr("shared.utils.ttl_cache.time.monotonic", lambda: now[0])
+    return now
+
+
+class TestTTLCache:
+    """Test TTLCache expiry, eviction and removal."""
+
+    def test_get_returns_stored_value(self, clock):
+        """Test a stored value is returned before it expires."""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing", "default") == "default"
+
+    def test_entry_expires_after_ttl(self, clock):
+        """Test an entry is dropped once its time-to-live has passed."""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+
+        clock[0] += 9.9
+        assert cache.get("a") == 1
+
+        clock[0] += 0.1
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_set_refreshes_expiry(self, clock):
+        """Test storing a key again restarts its time-to-live."""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+
+        clock[0] += 5
+        cache.set("a", 2)
+        clock[0] += 8
+
+        assert cache.get("a") == 2
+
+    def test_maxsize_evicts_least_recently_used(self, clock):
+        """Test the least recently used entry is evicted when the cache is full."""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        # Reading "a" makes "b" the least recently used entry
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_pop(self, clock):
+        """Test pop removes the entry and returns its value or the default."""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+
+        assert cache.pop("a") == 1
+        assert cache.get("a") is None
+        assert cache.pop("a") is None
+        assert cache.pop("a", "default") == "default"
+
+    def test_clear(self, clock):
+        """Test clear removes all entries."""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.clear()
+
+        assert len(cache) == 0
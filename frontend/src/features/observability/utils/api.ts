@@ -13,16 +13,19 @@ import type {
 export interface ObservabilityLogsResponse {
   logs: ObservabilityLog[]
   count: number
+  next_cursor?: string | null
 }
 
 export interface ObservabilityTracesResponse {
   traces: ObservabilityTrace[]
   count: number
+  next_cursor?: string | null
 }
 
 export interface ObservabilityMetricsResponse {
   metrics: ObservabilityMetric[]
   count: number
+  next_cursor?: string | null
 }
 
 export interface ObservabilityOverviewResponse {